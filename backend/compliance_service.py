@@ -4,73 +4,177 @@ Compliance Auditing Service
 Audits dataset manifests for copyright risk using the known publisher database.
 """
 
-import uuid
+import heapq
+import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
 from urllib.parse import urlparse
 
+import numpy as np
+import pandas as pd
+
 from .models import (
-    ManifestRow, AuditedRow, AuditResult, AuditSummary, RiskLevel,
+    ManifestRow, AuditedRow, AuditResult, AuditSummary, RiskLevel, RISK_TAGS,
 )
 from .copyright_domains import HIGH_RISK_DOMAINS, MEDIUM_RISK_DOMAINS, LOW_RISK_DOMAINS
 
+# Key under which a trie node stores its (risk_level, reason, publisher) entry
+_TERMINAL = None
+
+# Characters whose presence means a value is a URL rather than a bare hostname
+_URL_DELIMITERS = ("/", ":", "?", "#", "@", "[")
+
+
+def _build_domain_trie(databases: List[tuple]) -> Dict[Any, Any]:
+    """
+    Build a reversed-label trie from (domain_db, risk_level) pairs.
+
+    "pubmed.ncbi.nlm.nih.gov" is stored along the path gov → nih → nlm → ncbi → pubmed,
+    so every known suffix of a hostname is found in a single walk of its labels.
+    """
+    trie: Dict[Any, Any] = {}
+    for db, level in databases:
+        for known_domain, info in db.items():
+            node = trie
+            for label in reversed(known_domain.split(".")):
+                node = node.setdefault(label, {})
+            existing = node.get(_TERMINAL)
+            if existing is None or RISK_TAGS[level] > RISK_TAGS[existing[0]]:
+                node[_TERMINAL] = (level, info["reason"], info.get("publisher", ""))
+    return trie
+
+
+_RISK_DATABASES = [
+    (HIGH_RISK_DOMAINS, RiskLevel.HIGH),
+    (MEDIUM_RISK_DOMAINS, RiskLevel.MEDIUM),
+    (LOW_RISK_DOMAINS, RiskLevel.LOW),
+]
+_DOMAIN_TRIE = _build_domain_trie(_RISK_DATABASES)
+
+
+def _walk_trie(domain: str) -> Optional[tuple]:
+    """Return the trie entry that classifies a normalized domain, or None."""
+    # Walk the labels right-to-left; every terminal passed is a matching suffix.
+    # The most severe match wins, and the deepest (most specific) breaks ties.
+    match = None
+    node = _DOMAIN_TRIE
+    for label in reversed(domain.split(".")):
+        node = node.get(label)
+        if node is None:
+            break
+        entry = node.get(_TERMINAL)
+        if entry is not None and (match is None or RISK_TAGS[entry[0]] >= RISK_TAGS[match[0]]):
+            match = entry
+    return match
+
+
+# Exact-match index over every known domain. Each value is the trie's answer for that
+# key (HIGH over MEDIUM over LOW, a riskier parent suffix over the entry itself), so a
+# hit here can never disagree with the full walk.
+_DOMAIN_INDEX: Mapping[str, tuple] = MappingProxyType({
+    known_domain: _walk_trie(known_domain)
+    for db, _ in _RISK_DATABASES
+    for known_domain in db
+})
+
+
+# Manifests repeat the same few hundred hosts, so 2048 entries hold every distinct domain
+@lru_cache(maxsize=2048)
+def _classify(domain: str) -> tuple:
+    """Returns (risk_level, reason, publisher) for a domain (memoized per input)."""
+    domain = domain.lower().strip()
+    if domain.startswith("www."):
+        domain = domain[4:]
+
+    match = _DOMAIN_INDEX.get(domain) or _walk_trie(domain)
+    if match is not None:
+        return match
+
+    return RiskLevel.UNKNOWN, "Domain not in known database — manual review recommended", ""
+
+
+@lru_cache(maxsize=4096)
+def _extract_domain_cached(url_or_domain: str) -> str:
+    """Extract the registrable domain from a URL or domain string (memoized per input)."""
+    if not url_or_domain:
+        return ""
+    # Fast path: a bare hostname (the usual `domain` column value) needs no URL parsing
+    if not any(ch in url_or_domain for ch in _URL_DELIMITERS):
+        return url_or_domain.lower().strip().removeprefix("www.")
+    if "://" not in url_or_domain:
+        url_or_domain = "https://" + url_or_domain
+    try:
+        parsed = urlparse(url_or_domain)
+        host = parsed.hostname or ""
+    except Exception:
+        host = url_or_domain
+
+    host = host.lower().strip()
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+@dataclass
+class RowBuffer:
+    """Column-wise (SoA) copy of the audited rows' summary fields, one array entry per row."""
+
+    risk_tags: np.ndarray    # uint8, RISK_TAGS value per row
+    word_counts: np.ndarray  # int64
+    domains: np.ndarray      # object (str)
+
+    @classmethod
+    def from_columns(cls, risk_tags: List[int], word_counts: List[int], domains: List[str]) -> "RowBuffer":
+        return cls(
+            risk_tags=np.array(risk_tags, dtype=np.uint8),
+            word_counts=np.array(word_counts, dtype=np.int64),
+            domains=np.array(domains, dtype=object),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: List[AuditedRow]) -> "RowBuffer":
+        return cls.from_columns(
+            [r.risk_tag for r in rows], [r.word_count for r in rows], [r.domain for r in rows],
+        )
+
 
 class ComplianceAuditor:
     """Audits dataset manifests for copyright risk."""
 
-    def __init__(self):
-        self._high = HIGH_RISK_DOMAINS
-        self._medium = MEDIUM_RISK_DOMAINS
-        self._low = LOW_RISK_DOMAINS
-
     def _extract_domain(self, url_or_domain: str) -> str:
         """Extract the registrable domain from a URL or domain string."""
-        if not url_or_domain:
-            return ""
-        if "://" not in url_or_domain:
-            url_or_domain = "https://" + url_or_domain
-        try:
-            parsed = urlparse(url_or_domain)
-            host = parsed.hostname or ""
-        except Exception:
-            host = url_or_domain
-
-        host = host.lower().strip()
-        if host.startswith("www."):
-            host = host[4:]
-        return host
+        return _extract_domain_cached(url_or_domain)
 
     def _classify_domain(self, domain: str) -> tuple:
         """Returns (risk_level, reason, publisher)."""
-        domain = domain.lower().strip()
-        if domain.startswith("www."):
-            domain = domain[4:]
-
-        # Check exact match first, then suffix match
-        for db, level in [
-            (self._high, RiskLevel.HIGH),
-            (self._medium, RiskLevel.MEDIUM),
-            (self._low, RiskLevel.LOW),
-        ]:
-            if domain in db:
-                info = db[domain]
-                return level, info["reason"], info.get("publisher", "")
-            # Check if domain ends with a known domain (subdomain match)
-            for known_domain, info in db.items():
-                if domain.endswith("." + known_domain) or domain == known_domain:
-                    return level, info["reason"], info.get("publisher", "")
-
-        return RiskLevel.UNKNOWN, "Domain not in known database — manual review recommended", ""
+        return _classify(domain)
 
     def audit_manifest(self, rows: List[ManifestRow]) -> AuditResult:
-        """Audit each row in the manifest and return a detailed report."""
-        audited_rows = []
+        """
+        Audit each row in the manifest and return a detailed report.
 
-        for row in rows:
-            domain = self._extract_domain(row.domain or row.source_url)
-            risk_level, reason, publisher = self._classify_domain(domain)
+        The rows are already validated ManifestRows and every other field comes from
+        the domain database, so results are built with model_construct (no re-validation).
+        """
+        audited_rows, tags, word_counts, domains = self._classify_rows(rows)
+        return self._build_result(audited_rows, RowBuffer.from_columns(tags, word_counts, domains))
 
-            audited_rows.append(AuditedRow(
+    def _classify_rows(self, rows: List[ManifestRow]) -> tuple:
+        """Audit manifest rows; returns (audited_rows, risk_tags, word_counts, domains)."""
+        domains = [self._extract_domain(row.domain or row.source_url) for row in rows]
+
+        audited_rows = []
+        tags = []
+        word_counts = [row.word_count for row in rows]
+        for row, domain in zip(rows, domains):
+            risk_level, reason, publisher = self._classify_domain(domain)
+            tag = RISK_TAGS[risk_level]
+            tags.append(tag)
+            audited_rows.append(AuditedRow.model_construct(
                 source_url=row.source_url,
                 domain=domain,
                 content_type=row.content_type,
@@ -81,41 +185,109 @@ class ComplianceAuditor:
                 risk_level=risk_level,
                 risk_reason=reason,
                 publisher=publisher,
+                risk_tag=tag,
+            ))
+
+        return audited_rows, tags, word_counts, domains
+
+    def audit_frame(self, df: pd.DataFrame) -> AuditResult:
+        """
+        Audit a manifest DataFrame with one column per ManifestRow field.
+
+        Each distinct domain/URL value is resolved once rather than once per row, and the
+        rows are built with model_construct since the frame was typed at ingestion.
+        """
+        # Null cells become "" so every row gets a factorize code (no -1 sentinel)
+        domain_col = df["domain"].fillna("")
+        sources = domain_col.where(domain_col != "", df["source_url"].fillna(""))
+        codes, uniques = pd.factorize(sources)
+        resolved = []
+        for value in uniques:
+            domain = self._extract_domain(value)
+            risk_level, reason, publisher = self._classify_domain(domain)
+            resolved.append((domain, risk_level, reason, publisher, RISK_TAGS[risk_level]))
+
+        audited_rows = []
+        domains = []
+        tags = []
+        for code, record in zip(codes.tolist(), df.to_dict(orient="records")):
+            domain, risk_level, reason, publisher, tag = resolved[code]
+            domains.append(domain)
+            tags.append(tag)
+            audited_rows.append(AuditedRow.model_construct(
+                source_url=record["source_url"],
+                domain=domain,
+                content_type=record["content_type"],
+                word_count=record["word_count"],
+                date_collected=record["date_collected"],
+                license=record["license"],
+                copyright_holder=record["copyright_holder"] or publisher,
+                risk_level=risk_level,
+                risk_reason=reason,
+                publisher=publisher,
+                risk_tag=tag,
             ))
 
-        summary = self.generate_summary(audited_rows)
+        buffer = RowBuffer.from_columns(tags, df["word_count"].tolist(), domains)
+        return self._build_result(audited_rows, buffer)
 
-        return AuditResult(
-            audit_id=str(uuid.uuid4())[:8],
+    def _build_result(self, audited_rows: List[AuditedRow], buffer: RowBuffer) -> AuditResult:
+        """Wrap audited rows and their summary into an AuditResult."""
+        summary = self.generate_summary(audited_rows, buffer)
+
+        return AuditResult.model_construct(
+            audit_id=os.urandom(4).hex(),
             timestamp=datetime.now(timezone.utc).isoformat(),
             rows=audited_rows,
             summary=summary,
         )
 
-    def generate_summary(self, rows: List[AuditedRow]) -> AuditSummary:
-        """Generate summary statistics from audited rows."""
+    def generate_summary(self, rows: List[AuditedRow], buffer: Optional[RowBuffer] = None) -> AuditSummary:
+        """
+        Generate summary statistics from audited rows.
+
+        Counting and per-domain aggregation run on the RowBuffer columns; pass the buffer
+        built during the audit, otherwise one is built from the rows.
+        """
+        if buffer is None:
+            buffer = RowBuffer.from_rows(rows)
         total = len(rows)
-        high = sum(1 for r in rows if r.risk_level == RiskLevel.HIGH)
-        medium = sum(1 for r in rows if r.risk_level == RiskLevel.MEDIUM)
-        low = sum(1 for r in rows if r.risk_level == RiskLevel.LOW)
-        unknown = sum(1 for r in rows if r.risk_level == RiskLevel.UNKNOWN)
-
-        # Top risky domains
-        domain_risk: Dict[str, Dict[str, Any]] = {}
-        for r in rows:
-            if r.risk_level in (RiskLevel.HIGH, RiskLevel.MEDIUM):
-                if r.domain not in domain_risk:
-                    domain_risk[r.domain] = {
-                        "domain": r.domain,
-                        "publisher": r.publisher,
-                        "risk_level": r.risk_level.value,
-                        "count": 0,
-                        "total_words": 0,
-                    }
-                domain_risk[r.domain]["count"] += 1
-                domain_risk[r.domain]["total_words"] += r.word_count
-
-        top_risky = sorted(domain_risk.values(), key=lambda x: (-1 if x["risk_level"] == "high" else 0, -x["count"]))[:10]
+        medium_tag = RISK_TAGS[RiskLevel.MEDIUM]
+        high_tag = RISK_TAGS[RiskLevel.HIGH]
+
+        # counts[tag] per RISK_TAGS: 0=unknown, 1=low, 2=medium, 3=high
+        unknown, low, medium, high = (int(c) for c in np.bincount(buffer.risk_tags, minlength=4))
+
+        # Aggregate the risky domains; keep them in first-seen order so ties rank as listed
+        risky_idx = np.flatnonzero(buffer.risk_tags >= medium_tag)
+        domains, first_idx, inverse, url_counts = np.unique(
+            buffer.domains[risky_idx], return_index=True, return_inverse=True, return_counts=True,
+        )
+        total_words = np.zeros(len(domains), dtype=np.int64)
+        np.add.at(total_words, inverse.ravel(), buffer.word_counts[risky_idx])
+
+        domain_risk: List[Dict[str, Any]] = []
+        domains_by_risk: Dict[str, Dict[str, Dict[str, Any]]] = {
+            RiskLevel.HIGH.value: {}, RiskLevel.MEDIUM.value: {},
+        }
+        for i in np.argsort(first_idx, kind="stable"):
+            first = rows[risky_idx[first_idx[i]]]
+            domains_by_risk[first.risk_level.value][first.domain] = {
+                "publisher": first.publisher, "reason": first.risk_reason, "count": int(url_counts[i]),
+            }
+            domain_risk.append({
+                "domain": first.domain,
+                "publisher": first.publisher,
+                "risk_level": first.risk_level.value,
+                "count": int(url_counts[i]),
+                "total_words": int(total_words[i]),
+                "_hi": first.risk_tag == high_tag,
+            })
+
+        # High-risk first, then by URL count; nlargest keeps first-seen order on ties
+        top_risky = heapq.nlargest(10, domain_risk, key=itemgetter("_hi", "count"))
+        for entry in top_risky:
+            del entry["_hi"]
 
         # Recommendations
         recommendations = []
@@ -129,7 +301,7 @@ class ComplianceAuditor:
             recommendations.append("✅ No high or medium risk sources detected. Dataset appears compliant.")
         recommendations.append("📋 Generate a Federal Disclosure Form for regulatory filing.")
 
-        return AuditSummary(
+        return AuditSummary.model_construct(
             total_sources=total,
             high_risk_count=high,
             medium_risk_count=medium,
@@ -138,4 +310,53 @@ class ComplianceAuditor:
             high_risk_percentage=round(high / total * 100, 1) if total else 0.0,
             top_risky_domains=top_risky,
             recommendations=recommendations,
+            domains_by_risk=domains_by_risk,
         )
+
+
+@lru_cache(maxsize=1)
+def get_default_auditor() -> ComplianceAuditor:
+    """Shared auditor instance; the risk tables are module-level, so one instance serves every caller."""
+    return ComplianceAuditor()
+
+
+class AuditStore:
+    """In-memory audit storage with running totals for the dashboard stats."""
+
+    def __init__(self):
+        self._by_id: Dict[str, AuditResult] = {}
+        self._high_risk_total = 0
+        self._sources_total = 0
+        self._last_timestamp: Optional[str] = None
+
+    def add(self, audit: AuditResult) -> None:
+        """Store an audit and fold its summary into the running totals."""
+        previous = self._by_id.get(audit.audit_id)
+        if previous is not None:
+            self._high_risk_total -= previous.summary.high_risk_count
+            self._sources_total -= previous.summary.total_sources
+        self._by_id[audit.audit_id] = audit
+        self._high_risk_total += audit.summary.high_risk_count
+        self._sources_total += audit.summary.total_sources
+        self._last_timestamp = audit.timestamp
+
+    def get(self, audit_id: str) -> Optional[AuditResult]:
+        return self._by_id.get(audit_id)
+
+    def __contains__(self, audit_id: str) -> bool:
+        return audit_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def high_risk_total(self) -> int:
+        return self._high_risk_total
+
+    @property
+    def sources_total(self) -> int:
+        return self._sources_total
+
+    @property
+    def last_timestamp(self) -> Optional[str]:
+        return self._last_timestamp
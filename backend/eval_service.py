@@ -4,45 +4,65 @@ Evaluation Service
 Service layer for managing sweep results and heatmap data.
 """
 
-import json
+import mmap
 import os
 from typing import Dict, List, Optional, Any
 
+import orjson
+
 from .models import SweepResult, HeatmapCell, HeatmapResponse, DashboardStats
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 
+# Sample files larger than this are parsed straight from a read-only memory map
+MMAP_THRESHOLD_BYTES = 10 * 1024 * 1024
+
 
 class EvalService:
     """Manages evaluation results storage and retrieval."""
 
     def __init__(self):
         self._results: Dict[str, dict] = {}
+        self._latest_key: Optional[str] = None
+        # Derived responses, rebuilt lazily after each write
+        self._heatmap_cache: Optional[HeatmapResponse] = None
+        self._stats_cache: Optional[DashboardStats] = None
         self._load_sample_data()
 
     def _load_sample_data(self):
         """Load sample sweep results on startup."""
         sample_path = os.path.join(DATA_DIR, "sample_sweep_results.json")
         if os.path.exists(sample_path):
-            with open(sample_path) as f:
-                data = json.load(f)
+            with open(sample_path, "rb") as f:
+                if os.path.getsize(sample_path) > MMAP_THRESHOLD_BYTES:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        data = orjson.loads(view)
+                else:
+                    data = orjson.loads(f.read())
             self._results["sample"] = data
+            self._latest_key = "sample"
 
     def get_latest_results(self) -> Optional[dict]:
         """Return the most recent sweep results."""
-        if not self._results:
+        if self._latest_key is None:
             return None
-        key = list(self._results.keys())[-1]
-        return self._results[key]
+        return self._results.get(self._latest_key)
 
     def store_results(self, data: dict) -> str:
         """Store new sweep results, return key."""
         key = data.get("metadata", {}).get("timestamp", str(len(self._results)))
+        # Publish the data before the key so a concurrent reader never sees a dangling key
         self._results[key] = data
+        self._latest_key = key
+        self._heatmap_cache = None
+        self._stats_cache = None
         return key
 
     def get_heatmap(self) -> Optional[HeatmapResponse]:
         """Generate heatmap data from latest results."""
+        if self._heatmap_cache is not None:
+            return self._heatmap_cache
+
         results = self.get_latest_results()
         if not results:
             return None
@@ -62,14 +82,18 @@ class EvalService:
                     accuracy=round(acc, 4),
                 ))
 
-        return HeatmapResponse(
+        self._heatmap_cache = HeatmapResponse(
             cells=cells,
             architectures=architectures,
             subjects=subjects,
         )
+        return self._heatmap_cache
 
     def get_stats(self) -> DashboardStats:
-        """Get dashboard overview statistics."""
+        """Get dashboard overview statistics (a fresh copy, since callers fill in audit fields)."""
+        if self._stats_cache is not None:
+            return self._stats_cache.model_copy()
+
         latest = self.get_latest_results()
         robustness = 0.0
         last_eval = None
@@ -78,7 +102,7 @@ class EvalService:
             robustness = sa.get("robustness_score", 0.0)
             last_eval = latest.get("metadata", {}).get("timestamp")
 
-        return DashboardStats(
+        self._stats_cache = DashboardStats(
             models_tested=len(self._results),
             avg_robustness_score=robustness,
             datasets_audited=0,
@@ -86,3 +110,4 @@ class EvalService:
             total_sources_scanned=0,
             last_eval_date=last_eval,
         )
+        return self._stats_cache.model_copy()
@@ -4,26 +4,27 @@ ProjectSpark Backend — FastAPI Application
 """
 
 import io
-import json
-import csv as csv_module
 from typing import Optional
 
+import orjson
+import pandas as pd
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from .models import (
     SweepResult, HeatmapResponse, AuditResult, DisclosureFormData,
     DashboardStats, ManifestRow,
 )
 from .eval_service import EvalService
-from .compliance_service import ComplianceAuditor
+from .compliance_service import AuditStore, get_default_auditor
 from .pdf_generator import generate_disclosure_pdf
 
 app = FastAPI(
     title="ProjectSpark API",
     description="AI Governance & Evaluation Platform — LLM benchmark sensitivity analysis + CLEAR Act compliance",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -36,10 +37,37 @@ app.add_middleware(
 
 # Services
 eval_service = EvalService()
-auditor = ComplianceAuditor()
+auditor = get_default_auditor()
 
 # In-memory audit storage
-_audits: dict = {}
+_audits = AuditStore()
+
+# Manifest CSV columns, in ManifestRow field order
+MANIFEST_COLUMNS = list(ManifestRow.model_fields)
+
+
+def _read_manifest(content: bytes) -> pd.DataFrame:
+    """Parse an uploaded manifest CSV into a DataFrame with every ManifestRow column."""
+    # index_col=False keeps a row with surplus fields aligned to the header instead of
+    # promoting its first column to the index
+    options = dict(dtype=str, keep_default_na=False, encoding="utf-8", index_col=False)
+    try:
+        df = pd.read_csv(io.BytesIO(content), **options)
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame(columns=MANIFEST_COLUMNS)
+    except pd.errors.ParserError:
+        # A later row has surplus fields; drop them, as csv.DictReader did
+        width = len(pd.read_csv(io.BytesIO(content), nrows=0, **options).columns)
+        df = pd.read_csv(
+            io.BytesIO(content), engine="python", on_bad_lines=lambda fields: fields[:width], **options,
+        )
+    df = df.reindex(columns=MANIFEST_COLUMNS, fill_value="")
+
+    word_count = pd.to_numeric(df["word_count"].replace("", "0"))
+    if not pd.api.types.is_integer_dtype(word_count):
+        raise ValueError("word_count must contain whole numbers")
+    df["word_count"] = word_count
+    return df
 
 
 @app.get("/api/health")
@@ -61,10 +89,10 @@ async def upload_eval_results(file: UploadFile = File(...)):
     """Upload new sweep results JSON."""
     try:
         content = await file.read()
-        data = json.loads(content)
+        data = orjson.loads(content)
         key = eval_service.store_results(data)
         return {"status": "uploaded", "key": key}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON file")
 
 
@@ -81,25 +109,9 @@ async def get_heatmap():
 async def run_audit(file: UploadFile = File(...)):
     """Upload CSV manifest, return audit results."""
     try:
-        content = (await file.read()).decode("utf-8")
-        reader = csv_module.DictReader(io.StringIO(content))
-        rows = []
-        for row in reader:
-            rows.append(ManifestRow(
-                source_url=row.get("source_url", ""),
-                domain=row.get("domain", ""),
-                content_type=row.get("content_type", ""),
-                word_count=int(row.get("word_count", 0) or 0),
-                date_collected=row.get("date_collected", ""),
-                license=row.get("license", ""),
-                copyright_holder=row.get("copyright_holder", ""),
-            ))
-
-        result = auditor.audit_manifest(rows)
-        _audits[result.audit_id] = result
-
-        # Update stats
-        eval_service.get_stats().datasets_audited += 1
+        df = _read_manifest(await file.read())
+        result = auditor.audit_frame(df)
+        _audits.add(result)
 
         return result
     except Exception as e:
@@ -109,22 +121,21 @@ async def run_audit(file: UploadFile = File(...)):
 @app.get("/api/compliance/audit/{audit_id}", response_model=AuditResult)
 async def get_audit(audit_id: str):
     """Get audit results by ID."""
-    if audit_id not in _audits:
+    audit = _audits.get(audit_id)
+    if audit is None:
         raise HTTPException(status_code=404, detail=f"Audit {audit_id} not found")
-    return _audits[audit_id]
+    return audit
 
 
 @app.post("/api/compliance/disclosure-pdf")
 async def generate_disclosure(form_data: DisclosureFormData):
     """Generate Federal Disclosure Form PDF."""
-    audit = None
-    if form_data.audit_id and form_data.audit_id in _audits:
-        audit = _audits[form_data.audit_id]
+    audit = _audits.get(form_data.audit_id) if form_data.audit_id else None
 
-    pdf_bytes = generate_disclosure_pdf(form_data, audit)
+    pdf_buffer = generate_disclosure_pdf(form_data, audit)
 
     return StreamingResponse(
-        io.BytesIO(pdf_bytes),
+        pdf_buffer,
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=CLEAR_Act_Disclosure_Form.pdf"},
     )
@@ -135,12 +146,7 @@ async def get_stats():
     """Dashboard overview stats."""
     stats = eval_service.get_stats()
     stats.datasets_audited = len(_audits)
-    stats.high_risk_sources = sum(
-        a.summary.high_risk_count for a in _audits.values()
-    )
-    stats.total_sources_scanned = sum(
-        a.summary.total_sources for a in _audits.values()
-    )
-    if _audits:
-        stats.last_audit_date = list(_audits.values())[-1].timestamp
+    stats.high_risk_sources = _audits.high_risk_total
+    stats.total_sources_scanned = _audits.sources_total
+    stats.last_audit_date = _audits.last_timestamp
     return stats
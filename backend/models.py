@@ -3,7 +3,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class RiskLevel(str, Enum):
@@ -13,6 +13,10 @@ class RiskLevel(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Integer tag per risk level, ordered by severity (cheap to compare and index by)
+RISK_TAGS = {RiskLevel.UNKNOWN: 0, RiskLevel.LOW: 1, RiskLevel.MEDIUM: 2, RiskLevel.HIGH: 3}
+
+
 # ── Eval Models ──────────────────────────────────────────────
 
 class SubjectScore(BaseModel):
@@ -63,6 +67,9 @@ class HeatmapResponse(BaseModel):
 # ── Compliance Models ────────────────────────────────────────
 
 class ManifestRow(BaseModel):
+    # Rows are read-only input; frozen also makes them hashable
+    model_config = ConfigDict(frozen=True)
+
     source_url: str
     domain: str
     content_type: str = ""
@@ -83,6 +90,14 @@ class AuditedRow(BaseModel):
     risk_level: RiskLevel
     risk_reason: str
     publisher: str = ""
+    # Internal counterpart of risk_level from RISK_TAGS; not part of the API payload
+    risk_tag: Optional[int] = Field(default=None, exclude=True)
+
+    @model_validator(mode="after")
+    def _fill_risk_tag(self) -> "AuditedRow":
+        if self.risk_tag is None:
+            self.risk_tag = RISK_TAGS[self.risk_level]
+        return self
 
 
 class AuditSummary(BaseModel):
@@ -94,6 +109,8 @@ class AuditSummary(BaseModel):
     high_risk_percentage: float
     top_risky_domains: List[Dict[str, Any]]
     recommendations: List[str]
+    # risk level -> domain -> {publisher, reason, count}, first-seen order; kept out of API responses
+    domains_by_risk: Dict[str, Dict[str, Dict[str, Any]]] = Field(default_factory=dict, exclude=True)
 
 
 class AuditResult(BaseModel):
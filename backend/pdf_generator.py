@@ -6,12 +6,13 @@ for AI Training Data Disclosure pursuant to the CLEAR Act of 2026.
 """
 
 import io
+from collections import Counter
 from datetime import datetime
 from typing import List, Optional
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
@@ -22,21 +23,10 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from .models import AuditResult, DisclosureFormData, RiskLevel
 
 
-def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[AuditResult] = None) -> bytes:
-    """Generate a Federal Disclosure Form PDF and return as bytes."""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        topMargin=0.75 * inch,
-        bottomMargin=0.75 * inch,
-        leftMargin=0.75 * inch,
-        rightMargin=0.75 * inch,
-    )
-
+def _build_styles() -> StyleSheet1:
+    """Sample stylesheet plus the form's custom paragraph styles."""
     styles = getSampleStyleSheet()
 
-    # Custom styles
     styles.add(ParagraphStyle(
         "FormTitle", parent=styles["Title"],
         fontSize=16, spaceAfter=4, fontName="Helvetica-Bold",
@@ -63,7 +53,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         fontSize=10, fontName="Helvetica-Bold", spaceAfter=8,
     ))
     styles.add(ParagraphStyle(
-        "BodyText", parent=styles["Normal"],
+        "FormBody", parent=styles["Normal"],
         fontSize=9, fontName="Helvetica", alignment=TA_JUSTIFY,
         spaceAfter=6, leading=12,
     ))
@@ -77,7 +67,76 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         fontSize=8, fontName="Helvetica", textColor=colors.HexColor("#555555"),
         spaceAfter=4,
     ))
+    return styles
+
+
+# Built once at import; only the flowables are per-request
+_STYLES = _build_styles()
+
+# Table styles shared by every generated form
+ORG_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (0, -1), "Helvetica"),
+    ("FONTNAME", (2, 0), (2, -1), "Helvetica"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("FONTNAME", (1, 0), (1, -1), "Helvetica-Bold"),
+    ("FONTNAME", (3, 0), (3, -1), "Helvetica-Bold"),
+    ("TEXTCOLOR", (0, 0), (0, -1), colors.HexColor("#555555")),
+    ("TEXTCOLOR", (2, 0), (2, -1), colors.HexColor("#555555")),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("LINEBELOW", (1, 0), (1, -1), 0.5, colors.HexColor("#cccccc")),
+    ("LINEBELOW", (3, 0), (3, -1), 0.5, colors.HexColor("#cccccc")),
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2d2d2d")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("ALIGN", (1, 0), (-1, -1), "CENTER"),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#cccccc")),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f5f5")]),
+    ("TOPPADDING", (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+])
+
+HR_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 7.5),
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#8b0000")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#cccccc")),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.HexColor("#fff5f5"), colors.white]),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+])
+
+SIG_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("TOPPADDING", (0, 0), (-1, -1), 8),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+])
+
+
+FOOTER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+
+def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[AuditResult] = None) -> io.BytesIO:
+    """Generate a Federal Disclosure Form PDF and return it as a buffer rewound to the start."""
+    generated_at = datetime.now().strftime(FOOTER_TIMESTAMP_FORMAT)
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.75 * inch,
+        bottomMargin=0.75 * inch,
+        leftMargin=0.75 * inch,
+        rightMargin=0.75 * inch,
+    )
 
+    styles = _STYLES
     elements = []
 
     # ── Header ────────────────────────────────────────
@@ -100,19 +159,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         ["Contact Email:", form_data.contact_email or "N/A", "", ""],
     ]
     org_table = Table(org_data, colWidths=[1.5 * inch, 2.5 * inch, 1.3 * inch, 1.7 * inch])
-    org_table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (0, -1), "Helvetica"),
-        ("FONTNAME", (2, 0), (2, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("FONTNAME", (1, 0), (1, -1), "Helvetica-Bold"),
-        ("FONTNAME", (3, 0), (3, -1), "Helvetica-Bold"),
-        ("TEXTCOLOR", (0, 0), (0, -1), colors.HexColor("#555555")),
-        ("TEXTCOLOR", (2, 0), (2, -1), colors.HexColor("#555555")),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("LINEBELOW", (1, 0), (1, -1), 0.5, colors.HexColor("#cccccc")),
-        ("LINEBELOW", (3, 0), (3, -1), 0.5, colors.HexColor("#cccccc")),
-    ]))
+    org_table.setStyle(ORG_TABLE_STYLE)
     elements.append(org_table)
     elements.append(Spacer(1, 12))
 
@@ -146,17 +193,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         ]
 
     summary_table = Table(summary_data, colWidths=[3.5 * inch, 1.5 * inch, 2 * inch])
-    summary_table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2d2d2d")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("ALIGN", (1, 0), (-1, -1), "CENTER"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#cccccc")),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f5f5")]),
-        ("TOPPADDING", (0, 0), (-1, -1), 5),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-    ]))
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
     elements.append(summary_table)
     elements.append(Spacer(1, 16))
 
@@ -171,35 +208,26 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
             elements.append(Paragraph(
                 f"The following {len(high_risk_rows)} source(s) have been identified as HIGH RISK "
                 "due to active litigation, strict copyright enforcement, or restrictive licensing terms:",
-                styles["BodyText"],
+                styles["FormBody"],
             ))
             elements.append(Spacer(1, 6))
 
-            hr_data = [["#", "DOMAIN", "PUBLISHER", "CONTENT TYPE", "WORD COUNT", "RISK REASON"]]
-            for i, row in enumerate(high_risk_rows, 1):
-                hr_data.append([
-                    str(i), row.domain, row.publisher or "Unknown",
-                    row.content_type, f"{row.word_count:,}" if row.word_count else "N/A",
-                    row.risk_reason[:50],
-                ])
+            hr_data = [["#", "DOMAIN", "PUBLISHER", "CONTENT TYPE", "WORD COUNT", "RISK REASON"]] + [
+                [
+                    str(i), r.domain, r.publisher or "Unknown",
+                    r.content_type, format(r.word_count, ",") if r.word_count else "N/A",
+                    r.risk_reason[:50],
+                ]
+                for i, r in enumerate(high_risk_rows, 1)
+            ]
 
             hr_table = Table(hr_data, colWidths=[0.3 * inch, 1.2 * inch, 1.3 * inch, 0.9 * inch, 0.8 * inch, 2.5 * inch])
-            hr_table.setStyle(TableStyle([
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 7.5),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#8b0000")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#cccccc")),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.HexColor("#fff5f5"), colors.white]),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]))
+            hr_table.setStyle(HR_TABLE_STYLE)
             elements.append(hr_table)
         else:
-            elements.append(Paragraph("No high-risk sources identified.", styles["BodyText"]))
+            elements.append(Paragraph("No high-risk sources identified.", styles["FormBody"]))
     else:
-        elements.append(Paragraph("No audit data provided. Upload a dataset manifest to generate details.", styles["BodyText"]))
+        elements.append(Paragraph("No audit data provided. Upload a dataset manifest to generate details.", styles["FormBody"]))
 
     elements.append(Spacer(1, 16))
 
@@ -211,20 +239,17 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
     if audit:
         med_rows = [r for r in audit.rows if r.risk_level == RiskLevel.MEDIUM]
         if med_rows:
-            domains = {}
-            for r in med_rows:
-                domains.setdefault(r.domain, 0)
-                domains[r.domain] += 1
-            domain_list = ", ".join(f"{d} ({c})" for d, c in sorted(domains.items(), key=lambda x: -x[1]))
+            domains = Counter(r.domain for r in med_rows)
+            domain_list = ", ".join(f"{d} ({c})" for d, c in domains.most_common())
             elements.append(Paragraph(
                 f"{len(med_rows)} medium-risk source(s) identified from the following domains: {domain_list}. "
                 "These sources require attribution verification and TOS compliance review.",
-                styles["BodyText"],
+                styles["FormBody"],
             ))
         else:
-            elements.append(Paragraph("No medium-risk sources identified.", styles["BodyText"]))
+            elements.append(Paragraph("No medium-risk sources identified.", styles["FormBody"]))
     else:
-        elements.append(Paragraph("No audit data provided.", styles["BodyText"]))
+        elements.append(Paragraph("No audit data provided.", styles["FormBody"]))
 
     elements.append(Spacer(1, 20))
 
@@ -238,7 +263,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         "and complete to the best of my knowledge. I understand that willful misrepresentation "
         "of training data sources may result in penalties under Section 7(c) of the CLEAR Act of 2026, "
         "including fines up to $500,000 per violation and mandatory model withdrawal.",
-        styles["BodyText"],
+        styles["FormBody"],
     ))
     elements.append(Spacer(1, 24))
 
@@ -248,12 +273,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
         [f"Organization: {form_data.organization_name}", f"Email: {form_data.contact_email or '____________________'}"],
     ]
     sig_table = Table(sig_data, colWidths=[4 * inch, 3 * inch])
-    sig_table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("TOPPADDING", (0, 0), (-1, -1), 8),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]))
+    sig_table.setStyle(SIG_TABLE_STYLE)
     elements.append(sig_table)
     elements.append(Spacer(1, 20))
 
@@ -261,7 +281,7 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
     elements.append(HRFlowable(width="100%", thickness=1, color=colors.black))
     elements.append(Spacer(1, 4))
     elements.append(Paragraph(
-        f"Form CLEAR-2026-001  |  Generated: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}  |  "
+        f"Form CLEAR-2026-001  |  Generated: {generated_at}  |  "
         "This form is machine-generated by ProjectSpark Compliance Engine",
         styles["Footer"],
     ))
@@ -274,4 +294,4 @@ def generate_disclosure_pdf(form_data: DisclosureFormData, audit: Optional[Audit
 
     doc.build(elements)
     buffer.seek(0)
-    return buffer.read()
+    return buffer
@@ -0,0 +1,63 @@
+"""
+MMLU Task Lists
+================
+Single source of truth for the MMLU subject groups and their sub-tasks,
+shared by the sweep engine and the lm-eval result parser.
+"""
+
+from types import MappingProxyType
+
+SUBJECTS = ("stem", "humanities", "social_sciences", "other")
+
+# Number of tasks lm-eval groups under each subject
+SUBJECT_TASK_COUNTS = MappingProxyType({
+    "stem": 57,
+    "humanities": 52,
+    "social_sciences": 48,
+    "other": 43,
+})
+
+STEM_TASKS = (
+    "abstract_algebra", "anatomy", "astronomy", "college_biology",
+    "college_chemistry", "college_computer_science", "college_mathematics",
+    "college_physics", "computer_security", "conceptual_physics",
+    "electrical_engineering", "elementary_mathematics", "high_school_biology",
+    "high_school_chemistry", "high_school_computer_science",
+    "high_school_mathematics", "high_school_physics", "high_school_statistics",
+    "machine_learning",
+)
+
+HUMANITIES_TASKS = (
+    "formal_logic", "high_school_european_history",
+    "high_school_us_history", "high_school_world_history",
+    "international_law", "jurisprudence", "logical_fallacies",
+    "moral_disputes", "moral_scenarios", "philosophy",
+    "prehistory", "professional_law", "world_religions",
+)
+
+SOCIAL_SCIENCE_TASKS = (
+    "econometrics", "high_school_geography",
+    "high_school_government_and_politics", "high_school_macroeconomics",
+    "high_school_microeconomics", "high_school_psychology",
+    "human_sexuality", "professional_psychology", "public_relations",
+    "security_studies", "sociology", "us_foreign_policy",
+)
+
+OTHER_TASKS = (
+    "business_ethics", "clinical_knowledge", "college_medicine",
+    "global_facts", "human_aging", "management",
+    "marketing", "medical_genetics", "miscellaneous",
+    "nutrition", "professional_accounting", "professional_medicine",
+    "virology",
+)
+
+SUBJECT_TO_TASKS = MappingProxyType({
+    "stem": STEM_TASKS,
+    "humanities": HUMANITIES_TASKS,
+    "social_sciences": SOCIAL_SCIENCE_TASKS,
+    "other": OTHER_TASKS,
+})
+
+TASK_TO_SUBJECT = MappingProxyType({
+    task: subject for subject, tasks in SUBJECT_TO_TASKS.items() for task in tasks
+})
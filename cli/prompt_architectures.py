@@ -6,7 +6,16 @@ on multiple-choice benchmarks like MMLU.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+CHOICE_LABELS = "ABCDEFGHIJ"
+
+
+@lru_cache(maxsize=8192)
+def _format_choices(choices: Tuple[str, ...]) -> str:
+    """Render "(A) .. (B) .." lines; many questions share a choice set, so memoize."""
+    return "\n".join(f"({CHOICE_LABELS[i]}) {c}" for i, c in enumerate(choices))
 
 
 class PromptArchitecture(ABC):
@@ -16,19 +25,34 @@ class PromptArchitecture(ABC):
     description: str
     key: str
 
+    # Static scaffolding around the task prompt and the formatted choices
+    _PREFIX = ""
+    _INFIX = "\n\n"
+    _SUFFIX = ""
+
     @abstractmethod
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
         """Transform a raw task prompt + choices into the final prompt string."""
         ...
 
-    def _format_choices(self, choices: List[str]) -> str:
-        labels = "ABCDEFGHIJ"
-        return "\n".join(f"({labels[i]}) {c}" for i, c in enumerate(choices))
-
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self.name}>"
 
 
+def _build_example_block(examples: List[dict]) -> str:
+    """Render solved few-shot examples once; the block is identical for every question."""
+    parts = []
+    for i, ex in enumerate(examples, 1):
+        ex_choices = _format_choices(tuple(ex["choices"]))
+        parts.append(
+            f"Example {i}:\n"
+            f"Q: {ex['question']}\n"
+            f"{ex_choices}\n"
+            f"A: ({ex['answer']}) {ex['explanation']}\n\n"
+        )
+    return "".join(parts)
+
+
 class ZeroShot(PromptArchitecture):
     """Raw question with no examples, instructions, or scaffolding."""
 
@@ -36,12 +60,10 @@ class ZeroShot(PromptArchitecture):
     description = "Bare question with answer choices — no examples, no instructions."
     key = "zero_shot"
 
+    _SUFFIX = "\n\nAnswer:"
+
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
-        return (
-            f"{task_prompt}\n\n"
-            f"{self._format_choices(choices)}\n\n"
-            f"Answer:"
-        )
+        return "".join((task_prompt, self._INFIX, _format_choices(tuple(choices)), self._SUFFIX))
 
 
 class ChainOfThought(PromptArchitecture):
@@ -51,15 +73,16 @@ class ChainOfThought(PromptArchitecture):
     description = "Prepends 'Let's think step by step' reasoning scaffold."
     key = "chain_of_thought"
 
+    _SUFFIX = (
+        "\n\n"
+        "Let's think step by step. First, analyze what the question is asking. "
+        "Then, consider each answer choice carefully. "
+        "Finally, select the best answer based on your reasoning.\n\n"
+        "Step-by-step reasoning:\n"
+    )
+
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
-        return (
-            f"{task_prompt}\n\n"
-            f"{self._format_choices(choices)}\n\n"
-            f"Let's think step by step. First, analyze what the question is asking. "
-            f"Then, consider each answer choice carefully. "
-            f"Finally, select the best answer based on your reasoning.\n\n"
-            f"Step-by-step reasoning:\n"
-        )
+        return "".join((task_prompt, self._INFIX, _format_choices(tuple(choices)), self._SUFFIX))
 
 
 class PersonaBased(PromptArchitecture):
@@ -76,15 +99,16 @@ class PersonaBased(PromptArchitecture):
         "other": "You are a highly knowledgeable expert with broad interdisciplinary expertise across professional and academic domains.",
     }
 
+    # Full persona preamble per subject, ready to prepend to the task prompt
+    _PERSONA_PREFIXES = {
+        subject: f"{persona}\n\nGiven your expertise, please answer the following question:\n\n"
+        for subject, persona in PERSONA_MAP.items()
+    }
+    _SUFFIX = "\n\nBased on your expert knowledge, the correct answer is:"
+
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
-        persona = self.PERSONA_MAP.get(subject or "other", self.PERSONA_MAP["other"])
-        return (
-            f"{persona}\n\n"
-            f"Given your expertise, please answer the following question:\n\n"
-            f"{task_prompt}\n\n"
-            f"{self._format_choices(choices)}\n\n"
-            f"Based on your expert knowledge, the correct answer is:"
-        )
+        prefix = self._PERSONA_PREFIXES.get(subject or "other", self._PERSONA_PREFIXES["other"])
+        return "".join((prefix, task_prompt, self._INFIX, _format_choices(tuple(choices)), self._SUFFIX))
 
 
 class FewShot(PromptArchitecture):
@@ -115,26 +139,20 @@ class FewShot(PromptArchitecture):
         },
     ]
 
+    # Rendered once when the class is created; identical for every question
+    _EXAMPLE_BLOCK = _build_example_block(EXAMPLES)
+
+    _PREFIX = (
+        "Answer the following multiple-choice question. Here are some examples:\n\n"
+        + _EXAMPLE_BLOCK
+        + "Now answer this question:\n\n"
+        "Q: "
+    )
+    _INFIX = "\n"
+    _SUFFIX = "\n\nA:"
+
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
-        labels = "ABCDEFGHIJ"
-        example_block = ""
-        for i, ex in enumerate(self.EXAMPLES, 1):
-            ex_choices = "\n".join(f"({labels[j]}) {c}" for j, c in enumerate(ex["choices"]))
-            example_block += (
-                f"Example {i}:\n"
-                f"Q: {ex['question']}\n"
-                f"{ex_choices}\n"
-                f"A: ({ex['answer']}) {ex['explanation']}\n\n"
-            )
-
-        return (
-            f"Answer the following multiple-choice question. Here are some examples:\n\n"
-            f"{example_block}"
-            f"Now answer this question:\n\n"
-            f"Q: {task_prompt}\n"
-            f"{self._format_choices(choices)}\n\n"
-            f"A:"
-        )
+        return "".join((self._PREFIX, task_prompt, self._INFIX, _format_choices(tuple(choices)), self._SUFFIX))
 
 
 class DelimiterHeavy(PromptArchitecture):
@@ -144,22 +162,28 @@ class DelimiterHeavy(PromptArchitecture):
     description = "Uses ###, \"\"\", and explicit section markers for clarity."
     key = "delimiter_heavy"
 
+    _PREFIX = (
+        "### TASK ###\n"
+        "Answer the multiple-choice question below by selecting the correct option.\n\n"
+        "### QUESTION ###\n"
+        '"""\n'
+    )
+    _INFIX = (
+        "\n"
+        '"""\n\n'
+        "### ANSWER CHOICES ###\n"
+    )
+    _SUFFIX = (
+        "\n\n"
+        "### INSTRUCTIONS ###\n"
+        "- Read the question carefully\n"
+        "- Evaluate each option\n"
+        "- Respond with ONLY the letter of the correct answer\n\n"
+        "### YOUR ANSWER ###\n"
+    )
+
     def transform(self, task_prompt: str, choices: List[str], subject: Optional[str] = None) -> str:
-        return (
-            f"### TASK ###\n"
-            f"Answer the multiple-choice question below by selecting the correct option.\n\n"
-            f"### QUESTION ###\n"
-            f'"""\n'
-            f"{task_prompt}\n"
-            f'"""\n\n'
-            f"### ANSWER CHOICES ###\n"
-            f"{self._format_choices(choices)}\n\n"
-            f"### INSTRUCTIONS ###\n"
-            f"- Read the question carefully\n"
-            f"- Evaluate each option\n"
-            f"- Respond with ONLY the letter of the correct answer\n\n"
-            f"### YOUR ANSWER ###\n"
-        )
+        return "".join((self._PREFIX, task_prompt, self._INFIX, _format_choices(tuple(choices)), self._SUFFIX))
 
 
 # Registry of all architectures
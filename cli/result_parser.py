@@ -4,13 +4,47 @@ Result Parser
 Parses lm-evaluation-harness output into the normalized ProjectSpark schema.
 """
 
+import io
 import json
+import sys
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib parser
+    orjson = None
+
+from .mmlu_tasks import SUBJECTS, SUBJECT_TASK_COUNTS, SUBJECT_TO_TASKS, TASK_TO_SUBJECT
 from .prompt_architectures import ARCHITECTURE_MAP
 
 
+# Raw lm-eval keys per subject: the subject group itself, then its sub-tasks
+SUBJECT_MAPPING = {
+    subject: [f"mmlu_{subject}", *(f"mmlu_{task}" for task in tasks)]
+    for subject, tasks in SUBJECT_TO_TASKS.items()
+}
+
+TASK_COUNTS = SUBJECT_TASK_COUNTS
+
+SUBJECT_GROUP_KEYS = {subject: f"mmlu_{subject}" for subject in SUBJECT_MAPPING}
+
+# Inverse of SUBJECT_MAPPING, so raw lm-eval keys resolve in a single pass
+KEY_TO_SUBJECT = {
+    **{group_key: subject for subject, group_key in SUBJECT_GROUP_KEYS.items()},
+    **{f"mmlu_{task}": subject for task, subject in TASK_TO_SUBJECT.items()},
+}
+
+
+# Summary table layout: one ROW_FMT line per architecture
+TABLE_RULE = "=" * 80
+TABLE_HEADER = f"{'Architecture':<20} {'Overall':>8} {'STEM':>8} {'Human.':>8} {'Soc.Sci':>8} {'Other':>8}\n"
+TABLE_SUBJECT_FIELDS = (("stem", "stem"), ("humanities", "hum"), ("social_sciences", "soc"), ("other", "oth"))
+ROW_FMT = "{arch:<20} {overall:>7.1%} {stem:>7.1%} {hum:>7.1%} {soc:>7.1%} {oth:>7.1%}\n"
+
+
 def parse_lm_eval_output(raw_output: dict, model: str, architecture_key: str) -> Dict[str, Any]:
     """
     Parse raw lm-evaluation-harness JSON output into normalized per-architecture result.
@@ -26,46 +60,23 @@ def parse_lm_eval_output(raw_output: dict, model: str, architecture_key: str) ->
         "versions": {...}
     }
     """
-    SUBJECT_MAPPING = {
-        "stem": ["mmlu_stem", "mmlu_abstract_algebra", "mmlu_anatomy", "mmlu_astronomy",
-                 "mmlu_college_biology", "mmlu_college_chemistry", "mmlu_college_computer_science",
-                 "mmlu_college_mathematics", "mmlu_college_physics"],
-        "humanities": ["mmlu_humanities", "mmlu_formal_logic", "mmlu_philosophy",
-                       "mmlu_high_school_european_history", "mmlu_high_school_us_history",
-                       "mmlu_international_law", "mmlu_jurisprudence"],
-        "social_sciences": ["mmlu_social_sciences", "mmlu_econometrics",
-                            "mmlu_high_school_geography", "mmlu_high_school_psychology",
-                            "mmlu_sociology", "mmlu_us_foreign_policy"],
-        "other": ["mmlu_other", "mmlu_business_ethics", "mmlu_clinical_knowledge",
-                  "mmlu_global_facts", "mmlu_management", "mmlu_marketing"],
-    }
+    results_data = raw_output.get("results", {})
+    accs = dict.fromkeys(SUBJECT_MAPPING, 0.0)
 
-    TASK_COUNTS = {"stem": 57, "humanities": 52, "social_sciences": 48, "other": 43}
+    for key, metrics in results_data.items():
+        subject = KEY_TO_SUBJECT.get(key)
+        if subject is not None and key == SUBJECT_GROUP_KEYS[subject]:
+            accs[subject] = metrics.get("acc,none", metrics.get("acc", 0.0))
 
-    results_data = raw_output.get("results", {})
-    subjects = {}
-
-    for subject, possible_keys in SUBJECT_MAPPING.items():
-        acc = 0.0
-        details = {}
-        for key in possible_keys:
-            if key in results_data:
-                task_acc = results_data[key].get("acc,none", results_data[key].get("acc", 0.0))
-                stderr = results_data[key].get("acc_stderr,none", results_data[key].get("acc_stderr", 0.0))
-                if key.startswith(f"mmlu_{subject}") and key != f"mmlu_{subject}":
-                    task_name = key.replace("mmlu_", "")
-                    details[task_name] = {
-                        "accuracy": round(task_acc, 4),
-                        "stderr": round(stderr, 4) if stderr else None,
-                    }
-                elif key == f"mmlu_{subject}":
-                    acc = task_acc
-
-        subjects[subject] = {
-            "accuracy": round(acc, 4),
+    # Per-task details are left empty, as they always have been in live output
+    subjects = {
+        subject: {
+            "accuracy": round(accs[subject], 4),
             "tasks": TASK_COUNTS[subject],
-            "details": details if details else {},
+            "details": {},
         }
+        for subject in SUBJECT_MAPPING
+    }
 
     all_accs = [s["accuracy"] for s in subjects.values() if s["accuracy"] > 0]
     overall = sum(all_accs) / len(all_accs) if all_accs else 0.0
@@ -99,26 +110,26 @@ def normalize_sweep_results(
 
 def _compute_sensitivity(arch_results: Dict[str, Dict]) -> Dict[str, Any]:
     """Compute sensitivity analysis from architecture results."""
-    subjects = ["stem", "humanities", "social_sciences", "other"]
-    subject_variances = {}
-
-    for subj in subjects:
-        scores = []
-        for arch_data in arch_results.values():
-            if subj in arch_data.get("subjects", {}):
-                scores.append(arch_data["subjects"][subj]["accuracy"])
-        if scores:
-            mean = sum(scores) / len(scores)
-            variance = sum((s - mean) ** 2 for s in scores) / len(scores)
-            subject_variances[subj] = round(variance, 6)
-
-    max_var = max(subject_variances, key=subject_variances.get) if subject_variances else "unknown"
-
-    overall_scores = {k: v.get("overall_accuracy", 0) for k, v in arch_results.items()}
-    most_sensitive = max(overall_scores, key=overall_scores.get) if overall_scores else "unknown"
-
-    all_overall = list(overall_scores.values())
-    score_range = max(all_overall) - min(all_overall) if all_overall else 0.0
+    subjects = SUBJECTS
+    # One row per architecture, one column per subject; a missing subject is NaN
+    accs = np.array([
+        [arch_data["subjects"][subj]["accuracy"] if subj in arch_data.get("subjects", {}) else np.nan
+         for subj in subjects]
+        for arch_data in arch_results.values()
+    ], dtype=np.float64).reshape(-1, len(subjects))
+
+    present = ~np.isnan(accs).all(axis=0)
+    names = [subj for subj, has_scores in zip(subjects, present.tolist()) if has_scores]
+    variances = np.nanvar(accs[:, present], axis=0).tolist() if names else []
+    rounded = [round(variance, 6) for variance in variances]
+    subject_variances = dict(zip(names, rounded))
+
+    max_var = names[int(np.argmax(rounded))] if names else "unknown"
+
+    overall = np.array([v.get("overall_accuracy", 0) for v in arch_results.values()], dtype=np.float64)
+    most_sensitive = list(arch_results)[int(np.argmax(overall))] if overall.size else "unknown"
+
+    score_range = float(np.ptp(overall)) if overall.size else 0.0
     robustness = round(1.0 - min(score_range / 0.5, 1.0), 2)
 
     return {
@@ -132,39 +143,53 @@ def _compute_sensitivity(arch_results: Dict[str, Dict]) -> Dict[str, Any]:
 
 def load_results(path: str) -> Dict[str, Any]:
     """Load and validate a ProjectSpark results JSON file."""
-    with open(path) as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path) as f:
+            data = json.load(f)
 
     required_keys = {"metadata", "results"}
     if not required_keys.issubset(data.keys()):
         raise ValueError(f"Missing required keys: {required_keys - data.keys()}")
 
+    # Parsed keys are fresh strings; intern architecture and subject names so the
+    # repeated lookups in the table and sensitivity code hit the identity fast path
+    data["results"] = {
+        sys.intern(arch_key): (
+            {**arch_data, "subjects": {sys.intern(subj): v for subj, v in arch_data["subjects"].items()}}
+            if isinstance(arch_data.get("subjects"), dict) else arch_data
+        )
+        for arch_key, arch_data in data["results"].items()
+    }
+
     return data
 
 
 def results_summary_table(data: Dict[str, Any]) -> str:
     """Generate a printable summary table from results."""
-    lines = []
+    buf = io.StringIO()
     meta = data["metadata"]
-    lines.append(f"Model: {meta['model']}  |  Benchmark: {meta['benchmark']}  |  {meta['timestamp']}")
-    lines.append("=" * 80)
-    lines.append(f"{'Architecture':<20} {'Overall':>8} {'STEM':>8} {'Human.':>8} {'Soc.Sci':>8} {'Other':>8}")
-    lines.append("-" * 80)
+    buf.write(f"Model: {meta['model']}  |  Benchmark: {meta['benchmark']}  |  {meta['timestamp']}\n")
+    buf.write(TABLE_RULE + "\n")
+    buf.write(TABLE_HEADER)
+    buf.write("-" * 80 + "\n")
 
     for arch_key, arch_data in data["results"].items():
-        overall = arch_data.get("overall_accuracy", 0)
-        stem = arch_data.get("subjects", {}).get("stem", {}).get("accuracy", 0)
-        hum = arch_data.get("subjects", {}).get("humanities", {}).get("accuracy", 0)
-        soc = arch_data.get("subjects", {}).get("social_sciences", {}).get("accuracy", 0)
-        oth = arch_data.get("subjects", {}).get("other", {}).get("accuracy", 0)
-        lines.append(f"{arch_key:<20} {overall:>7.1%} {stem:>7.1%} {hum:>7.1%} {soc:>7.1%} {oth:>7.1%}")
+        subjects = arch_data.get("subjects", {})
+        buf.write(ROW_FMT.format_map({
+            "arch": arch_key,
+            "overall": arch_data.get("overall_accuracy", 0),
+            **{field: subjects.get(subj, {}).get("accuracy", 0) for subj, field in TABLE_SUBJECT_FIELDS},
+        }))
 
-    lines.append("=" * 80)
+    buf.write(TABLE_RULE)
 
     if "sensitivity_analysis" in data:
         sa = data["sensitivity_analysis"]
-        lines.append(f"Robustness Score: {sa.get('robustness_score', 'N/A')}")
-        lines.append(f"Most Sensitive Subject: {sa.get('max_variance_subject', 'N/A')}")
-        lines.append(f"Highest-Performing Architecture: {sa.get('most_sensitive_architecture', 'N/A')}")
+        buf.write(f"\nRobustness Score: {sa.get('robustness_score', 'N/A')}")
+        buf.write(f"\nMost Sensitive Subject: {sa.get('max_variance_subject', 'N/A')}")
+        buf.write(f"\nHighest-Performing Architecture: {sa.get('most_sensitive_architecture', 'N/A')}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
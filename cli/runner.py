@@ -9,7 +9,7 @@ Usage:
 
 import argparse
 import sys
-import os
+from pathlib import Path
 
 from .prompt_architectures import ALL_ARCHITECTURES, ARCHITECTURE_MAP
 from .sweep_engine import SensitivitySweep
@@ -85,26 +85,28 @@ def main(argv=None):
 
     # Select architectures
     if args.architectures:
-        archs = []
-        for key in args.architectures:
-            if key not in ARCHITECTURE_MAP:
-                print(f"✗ Unknown architecture: {key}")
-                print(f"  Available: {list(ARCHITECTURE_MAP.keys())}")
-                sys.exit(1)
-            archs.append(ARCHITECTURE_MAP[key])
+        unknown = set(args.architectures) - ARCHITECTURE_MAP.keys()
+        if unknown:
+            # Report every bad key at once, in the order given
+            bad = [key for key in dict.fromkeys(args.architectures) if key in unknown]
+            print(f"✗ Unknown architecture{'s' if len(bad) > 1 else ''}: {', '.join(bad)}\n"
+                  f"  Available: {list(ARCHITECTURE_MAP.keys())}")
+            sys.exit(1)
+        archs = [ARCHITECTURE_MAP[key] for key in args.architectures]
     else:
         archs = ALL_ARCHITECTURES
 
     if not args.quiet:
-        print()
-        print("⚡ ProjectSpark — AI Eval Harness Benchmarker")
-        print("=" * 50)
-        print(f"  Model:       {args.model}")
-        print(f"  Benchmark:   {args.benchmark}")
-        print(f"  Mode:        {args.mode}")
-        print(f"  Architectures: {len(archs)}")
-        print("=" * 50)
-        print()
+        print(
+            "\n"
+            "⚡ ProjectSpark — AI Eval Harness Benchmarker\n"
+            f"{'=' * 50}\n"
+            f"  Model:       {args.model}\n"
+            f"  Benchmark:   {args.benchmark}\n"
+            f"  Mode:        {args.mode}\n"
+            f"  Architectures: {len(archs)}\n"
+            f"{'=' * 50}\n"
+        )
 
     # Run sweep
     sweep = SensitivitySweep(
@@ -115,21 +117,19 @@ def main(argv=None):
     )
 
     if not args.quiet:
-        print("Running sensitivity sweep...")
-        for arch in archs:
-            print(f"  ▸ {arch.name} ({arch.key})")
+        print("\n".join(["Running sensitivity sweep...", *(f"  ▸ {arch.name} ({arch.key})" for arch in archs)]))
 
     results = sweep.run_sweep()
 
     # Display results
     if not args.quiet:
-        print()
-        print(results_summary_table(results.to_dict()))
-        print()
+        print(f"\n{results_summary_table(results.to_dict())}\n")
 
     # Export
     if args.output:
-        os.makedirs(os.path.dirname(args.output) if os.path.dirname(args.output) else ".", exist_ok=True)
+        parent = Path(args.output).parent
+        if str(parent) not in ("", "."):
+            parent.mkdir(parents=True, exist_ok=True)
         if args.format == "csv":
             sweep.export_csv(args.output)
         else:
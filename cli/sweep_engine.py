@@ -8,16 +8,46 @@ collecting per-subject accuracy scores.
 import json
 import csv
 import random
-import hashlib
+import sys
+import zlib
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+from . import mmlu_tasks
+from .mmlu_tasks import SUBJECTS
 from .prompt_architectures import ALL_ARCHITECTURES, PromptArchitecture
 
 
+# Demo noise only needs a reproducible spread, not a cryptographic hash. CRC32 is
+# fixed by the zlib format, so demo numbers are stable across Python versions.
+def _seed_hash(seed_str: str) -> int:
+    return zlib.crc32(seed_str.encode())
+
+
+@lru_cache(maxsize=None)
+def _task_sample_count(task: str) -> int:
+    """Demo sample count for a task; depends only on the task name."""
+    return 80 + (_seed_hash(task) % 120)
+
+
+CSV_FIELDS = ("model", "architecture", "subject", "accuracy", "tasks")
+
+
 class SweepResults:
     """Container for sweep results with export capabilities."""
 
+    __slots__ = (
+        "model", "benchmark", "mode", "timestamp", "architecture_results", "sensitivity_analysis",
+    )
+
     def __init__(self, model: str, benchmark: str, mode: str):
         self.model = model
         self.benchmark = benchmark
@@ -27,6 +57,8 @@ class SweepResults:
         self.sensitivity_analysis: Dict[str, Any] = {}
 
     def add_architecture_result(self, arch_key: str, overall: float, subjects: Dict[str, Dict]):
+        arch_key = sys.intern(arch_key)
+        subjects = {sys.intern(subj): subj_data for subj, subj_data in subjects.items()}
         self.architecture_results[arch_key] = {
             "overall_accuracy": round(overall, 4),
             "subjects": subjects,
@@ -34,27 +66,28 @@ class SweepResults:
 
     def compute_sensitivity(self):
         """Compute cross-architecture sensitivity metrics."""
-        subject_variances = {}
-        all_subjects = ["stem", "humanities", "social_sciences", "other"]
-
-        for subj in all_subjects:
-            scores = []
-            for arch_data in self.architecture_results.values():
-                if subj in arch_data["subjects"]:
-                    scores.append(arch_data["subjects"][subj]["accuracy"])
-            if scores:
-                mean = sum(scores) / len(scores)
-                variance = sum((s - mean) ** 2 for s in scores) / len(scores)
-                subject_variances[subj] = round(variance, 6)
-
-        max_var_subject = max(subject_variances, key=subject_variances.get) if subject_variances else "unknown"
-
-        overall_scores = {k: v["overall_accuracy"] for k, v in self.architecture_results.items()}
-        most_sensitive = max(overall_scores, key=overall_scores.get) if overall_scores else "unknown"
-
-        all_scores = [v["overall_accuracy"] for v in self.architecture_results.values()]
-        if all_scores:
-            score_range = max(all_scores) - min(all_scores)
+        # One row per architecture, one column per subject; a missing subject is NaN
+        arch_keys, overall, accs = [], [], []
+        for arch_key, arch_overall, subjects in self.iter_arch():
+            arch_keys.append(arch_key)
+            overall.append(arch_overall)
+            accs.append([subjects[subj]["accuracy"] if subj in subjects else np.nan for subj in SUBJECTS])
+        overall = np.array(overall, dtype=np.float64)
+        accs = np.array(accs, dtype=np.float64).reshape(-1, len(SUBJECTS))
+
+        present = ~np.isnan(accs).all(axis=0)
+        names = [subj for subj, scored in zip(SUBJECTS, present.tolist()) if scored]
+        variances = np.nanvar(accs[:, present], axis=0).tolist() if names else []
+        rounded = [round(variance, 6) for variance in variances]
+        subject_variances = dict(zip(names, rounded))
+
+        max_var_subject = names[int(np.argmax(rounded))] if names else "unknown"
+
+        most_sensitive = arch_keys[int(np.argmax(overall))] if overall.size else "unknown"
+
+        has_scores = overall.size > 0
+        if has_scores:
+            score_range = float(np.ptp(overall))
             robustness = round(1.0 - min(score_range / 0.5, 1.0), 2)
         else:
             robustness = 0.0
@@ -64,9 +97,14 @@ class SweepResults:
             "most_sensitive_architecture": most_sensitive,
             "robustness_score": robustness,
             "subject_variances": subject_variances,
-            "overall_range": round(score_range, 4) if all_scores else 0.0,
+            "overall_range": round(score_range, 4) if has_scores else 0.0,
         }
 
+    def iter_arch(self) -> Iterator[Tuple[str, float, Dict[str, Dict]]]:
+        """Yield (arch_key, overall_accuracy, subjects) per architecture, in sweep order."""
+        for arch_key, arch_data in self.architecture_results.items():
+            yield arch_key, arch_data["overall_accuracy"], arch_data["subjects"]
+
     def to_dict(self) -> dict:
         return {
             "metadata": {
@@ -84,14 +122,11 @@ class SweepResults:
 class SensitivitySweep:
     """Runs a model through all prompt architectures on MMLU benchmark."""
 
-    SUBJECTS = ["stem", "humanities", "social_sciences", "other"]
+    __slots__ = ("model_name", "architectures", "benchmark", "mode", "results")
 
-    SUBJECT_TASK_COUNTS = {
-        "stem": 57,
-        "humanities": 52,
-        "social_sciences": 48,
-        "other": 43,
-    }
+    SUBJECTS = list(SUBJECTS)
+
+    SUBJECT_TASK_COUNTS = mmlu_tasks.SUBJECT_TASK_COUNTS
 
     # Realistic demo baselines per (architecture, subject)
     DEMO_SCORES = {
@@ -112,39 +147,12 @@ class SensitivitySweep:
         },
     }
 
-    STEM_TASKS = [
-        "abstract_algebra", "anatomy", "astronomy", "college_biology",
-        "college_chemistry", "college_computer_science", "college_mathematics",
-        "college_physics", "computer_security", "conceptual_physics",
-        "electrical_engineering", "elementary_mathematics", "high_school_biology",
-        "high_school_chemistry", "high_school_computer_science",
-        "high_school_mathematics", "high_school_physics", "high_school_statistics",
-        "machine_learning",
-    ]
-
-    HUMANITIES_TASKS = [
-        "formal_logic", "high_school_european_history",
-        "high_school_us_history", "high_school_world_history",
-        "international_law", "jurisprudence", "logical_fallacies",
-        "moral_disputes", "moral_scenarios", "philosophy",
-        "prehistory", "professional_law", "world_religions",
-    ]
-
-    SOCIAL_SCIENCE_TASKS = [
-        "econometrics", "high_school_geography",
-        "high_school_government_and_politics", "high_school_macroeconomics",
-        "high_school_microeconomics", "high_school_psychology",
-        "human_sexuality", "professional_psychology", "public_relations",
-        "security_studies", "sociology", "us_foreign_policy",
-    ]
-
-    OTHER_TASKS = [
-        "business_ethics", "clinical_knowledge", "college_medicine",
-        "global_facts", "human_aging", "management",
-        "marketing", "medical_genetics", "miscellaneous",
-        "nutrition", "professional_accounting", "professional_medicine",
-        "virology",
-    ]
+    # Task lists live in mmlu_tasks, shared with the result parser
+    STEM_TASKS = mmlu_tasks.STEM_TASKS
+    HUMANITIES_TASKS = mmlu_tasks.HUMANITIES_TASKS
+    SOCIAL_SCIENCE_TASKS = mmlu_tasks.SOCIAL_SCIENCE_TASKS
+    OTHER_TASKS = mmlu_tasks.OTHER_TASKS
+    SUBJECT_TO_TASKS = mmlu_tasks.SUBJECT_TO_TASKS
 
     def __init__(self, model_name: str, architectures: Optional[List[PromptArchitecture]] = None,
                  benchmark: str = "mmlu", mode: str = "demo"):
@@ -156,73 +164,107 @@ class SensitivitySweep:
 
     def _seeded_noise(self, base: float, seed_str: str, spread: float = 0.03) -> float:
         """Deterministic noise based on seed string for reproducibility."""
-        h = int(hashlib.sha256(seed_str.encode()).hexdigest()[:8], 16)
+        h = _seed_hash(seed_str)
         noise = ((h % 10000) / 10000.0 - 0.5) * 2 * spread
         return max(0.0, min(1.0, base + noise))
 
     def _generate_task_details(self, tasks: List[str], base_acc: float, arch_key: str) -> Dict:
-        details = {}
-        for task in tasks:
-            seed = f"{self.model_name}:{arch_key}:{task}"
-            acc = self._seeded_noise(base_acc, seed, spread=0.06)
-            n_samples = 80 + (int(hashlib.sha256(task.encode()).hexdigest()[:4], 16) % 120)
-            correct = int(n_samples * acc)
-            details[task] = {
+        # Same noise as _seeded_noise, computed for every task at once
+        spread = 0.06
+        prefix = f"{self.model_name}:{arch_key}:"
+        hashes = np.fromiter((_seed_hash(prefix + task) for task in tasks), dtype=np.uint32, count=len(tasks))
+        noise = ((hashes % 10000) / 10000.0 - 0.5) * 2 * spread
+        accs = np.clip(base_acc + noise, 0.0, 1.0)
+        n_samples = np.array([_task_sample_count(task) for task in tasks], dtype=np.int64)
+        correct = (n_samples * accs).astype(np.int64)
+
+        return {
+            task: {
                 "accuracy": round(acc, 4),
-                "correct": correct,
-                "total": n_samples,
+                "correct": c,
+                "total": n,
             }
-        return details
+            for task, acc, c, n in zip(tasks, accs.tolist(), correct.tolist(), n_samples.tolist())
+        }
 
-    def _run_demo(self):
-        """Generate realistic demo results."""
-        for arch in self.architectures:
-            base_scores = self.DEMO_SCORES.get(arch.key, self.DEMO_SCORES["zero_shot"])
-            subjects = {}
-            task_map = {
-                "stem": self.STEM_TASKS,
-                "humanities": self.HUMANITIES_TASKS,
-                "social_sciences": self.SOCIAL_SCIENCE_TASKS,
-                "other": self.OTHER_TASKS,
+    def _compute_arch_result(self, arch_key: str) -> tuple:
+        """Demo scores for one architecture; returns (arch_key, overall, subjects)."""
+        base_scores = self.DEMO_SCORES.get(arch_key, self.DEMO_SCORES["zero_shot"])
+        subjects = {}
+        weighted_sum = 0.0
+        total_tasks = 0
+
+        for subj in self.SUBJECTS:
+            base = base_scores[subj]
+            seed = f"{self.model_name}:{arch_key}:{subj}"
+            acc = self._seeded_noise(base, seed, spread=0.008)
+            tasks = self.SUBJECT_TO_TASKS[subj]
+            details = self._generate_task_details(tasks, acc, arch_key)
+            n_tasks = self.SUBJECT_TASK_COUNTS[subj]
+
+            subjects[subj] = {
+                "accuracy": round(acc, 4),
+                "tasks": n_tasks,
+                "details": details,
             }
 
-            weighted_sum = 0.0
-            total_tasks = 0
+            weighted_sum += acc * n_tasks
+            total_tasks += n_tasks
+
+        overall = weighted_sum / total_tasks if total_tasks else 0.0
+        return arch_key, overall, subjects
 
-            for subj in self.SUBJECTS:
-                base = base_scores[subj]
-                seed = f"{self.model_name}:{arch.key}:{subj}"
-                acc = self._seeded_noise(base, seed, spread=0.008)
-                tasks = task_map[subj]
-                details = self._generate_task_details(tasks, acc, arch.key)
-                n_tasks = self.SUBJECT_TASK_COUNTS[subj]
+    def _run_demo(self):
+        """Generate realistic demo results."""
+        for arch in self.architectures:
+            self.results.add_architecture_result(*self._compute_arch_result(arch.key))
 
-                subjects[subj] = {
-                    "accuracy": round(acc, 4),
-                    "tasks": n_tasks,
-                    "details": details,
-                }
+    def _load_live_model(self):
+        """Build the lm-eval model: vLLM (continuous batching) when available, else HF."""
+        try:
+            from lm_eval.models.vllm_causallms import VLLM
+        except ImportError:
+            print("⚠  vLLM backend unavailable. Using the HuggingFace backend.")
+            print("   Install with: pip install lm-eval[vllm]")
+        else:
+            try:
+                return VLLM(
+                    pretrained=self.model_name,
+                    trust_remote_code=True,
+                    dtype="auto",
+                    gpu_memory_utilization=0.9,
+                    max_model_len=2048,
+                    # The ready-made LM object's batch size wins over simple_evaluate's, and
+                    # VLLM defaults to 1; "auto" lets vLLM batch the requests continuously
+                    batch_size="auto",
+                    # Every MMLU request in a task repeats the same task preamble (and, for
+                    # few-shot runs, the same examples), so that shared prefix is prefilled once
+                    enable_prefix_caching=True,
+                )
+            except Exception as e:
+                # vLLM raises assorted errors (e.g. ValueError) on unsupported or CPU-only hosts
+                print(f"⚠  vLLM backend failed to start ({e}). Using the HuggingFace backend.")
 
-                weighted_sum += acc * n_tasks
-                total_tasks += n_tasks
+        from lm_eval.models.huggingface import HFLM
 
-            overall = weighted_sum / total_tasks if total_tasks else 0.0
-            self.results.add_architecture_result(arch.key, overall, subjects)
+        return HFLM(pretrained=self.model_name, trust_remote_code=True, batch_size="auto")
 
     def _run_live(self):
         """Interface with lm-evaluation-harness for live evaluation."""
         try:
-            import lm_eval
             from lm_eval import evaluator, tasks
 
+            # Load the model and index the task registry once; every architecture
+            # reuses them instead of reloading weights per simple_evaluate call.
+            lm = self._load_live_model()
+            task_manager = tasks.TaskManager()
+
             for arch in self.architectures:
-                task_manager = tasks.TaskManager()
                 results = evaluator.simple_evaluate(
-                    model="hf",
-                    model_args=f"pretrained={self.model_name},trust_remote_code=True",
+                    model=lm,
                     tasks=["mmlu"],
                     num_fewshot=3 if arch.key == "few_shot" else 0,
-                    batch_size="auto",
+                    task_manager=task_manager,
                 )
 
                 subjects = {}
@@ -258,25 +300,20 @@ class SensitivitySweep:
 
     def export_json(self, path: str):
         """Export results to JSON file."""
-        with open(path, "w") as f:
-            json.dump(self.results.to_dict(), f, indent=2)
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(self.results.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.results.to_dict(), f, indent=2, ensure_ascii=False)
         print(f"✓ Results exported to {path}")
 
     def export_csv(self, path: str):
         """Export results to CSV file."""
-        rows = []
-        for arch_key, arch_data in self.results.architecture_results.items():
-            for subj, subj_data in arch_data["subjects"].items():
-                rows.append({
-                    "model": self.model_name,
-                    "architecture": arch_key,
-                    "subject": subj,
-                    "accuracy": subj_data["accuracy"],
-                    "tasks": subj_data["tasks"],
-                })
-
         with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["model", "architecture", "subject", "accuracy", "tasks"])
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for arch_key, arch_data in self.results.architecture_results.items():
+                for subj, subj_data in arch_data["subjects"].items():
+                    writer.writerow((self.model_name, arch_key, subj, subj_data["accuracy"], subj_data["tasks"]))
         print(f"✓ Results exported to {path}")
@@ -0,0 +1,23 @@
+"""
+Result JSON writer shared by the test scripts.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+Both paths write the same bytes: 2-space indent, non-ASCII kept as UTF-8.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib writer
+    orjson = None
+
+
+def write_json(path, payload):
+    """Write ``payload`` (str-keyed, plain values) to ``path`` as indented UTF-8 JSON."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
@@ -3,22 +3,31 @@
 Fragility Test: Llama-3-8B Sensitivity Sweep
 ==============================================
 Runs the sweep engine in demo mode and compares against leaderboard scores.
+
+Set SPARK_WRITE_FINDINGS=1 to also write the findings markdown to tests/results/.
 """
 
-import sys, os, json
+import sys, os, io, math
+from operator import itemgetter
+from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from tests.result_io import write_json
 from cli.sweep_engine import SensitivitySweep
 
+RESULTS = Path(__file__).parent / "results"
+# The findings markdown is a demo artifact; it is only written when SPARK_WRITE_FINDINGS=1
+WRITE_FINDINGS = os.environ.get("SPARK_WRITE_FINDINGS") == "1"
+
 
 def main():
+    RESULTS.mkdir(exist_ok=True)
     print("=" * 70)
     print("  Fragility Test: Llama-3-8B — Project Spark Sensitivity Sweep")
     print("=" * 70)
 
     sweep = SensitivitySweep(model_name="meta-llama/Meta-Llama-3-8B", benchmark="mmlu", mode="demo")
     results = sweep.run_sweep()
-    data = results.to_dict()
 
     # Reference leaderboard score
     LEADERBOARD_SCORE = 66.6
@@ -27,12 +36,14 @@ def main():
     print(f"{'Architecture':<25} {'Overall':>8}  {'STEM':>8}  {'Humanities':>8}  {'SocSci':>8}  {'Other':>8}")
     print("-" * 80)
 
-    all_overalls = []
+    best, worst = -math.inf, math.inf
     arch_rows = []
-    for arch_key, arch_data in data["results"].items():
-        overall = arch_data["overall_accuracy"] * 100
-        all_overalls.append(overall)
-        subj = arch_data["subjects"]
+    for arch_key, accuracy, subj in results.iter_arch():
+        overall = accuracy * 100
+        if overall > best:
+            best = overall
+        if overall < worst:
+            worst = overall
         stem = subj.get("stem", {}).get("accuracy", 0) * 100
         hum = subj.get("humanities", {}).get("accuracy", 0) * 100
         soc = subj.get("social_sciences", {}).get("accuracy", 0) * 100
@@ -41,20 +52,18 @@ def main():
         marker = " ◄ LEADERBOARD" if abs(overall - LEADERBOARD_SCORE) < 1.5 else ""
         print(f"  {arch_key:<23} {overall:>7.1f}%  {stem:>7.1f}%  {hum:>7.1f}%  {soc:>7.1f}%  {oth:>7.1f}%{marker}")
 
-    best = max(all_overalls)
-    worst = min(all_overalls)
     delta = best - worst
-    sa = data["sensitivity_analysis"]
+    sa = results.sensitivity_analysis
 
     print(f"\n🔬 Consistency Delta: {delta:.1f} percentage points (range: {worst:.1f}% – {best:.1f}%)")
     print(f"🛡️  Robustness Score: {sa['robustness_score']:.2f} (1.0 = perfectly consistent)")
     print(f"📉 Most variable subject: {sa['max_variance_subject']}")
 
     # Save JSON
-    out_path = os.path.join(os.path.dirname(__file__), "results", "fragility_test_results.json")
+    out_path = RESULTS / "fragility_test_results.json"
     output = {
         "leaderboard_reference": {"source": "HuggingFace Open LLM Leaderboard", "score": LEADERBOARD_SCORE},
-        "sweep_results": data,
+        "sweep_results": results.to_dict(),
         "analysis": {
             "consistency_delta": round(delta, 2),
             "best_score": round(best, 2),
@@ -62,14 +71,17 @@ def main():
             "robustness_score": sa["robustness_score"],
         },
     }
-    with open(out_path, "w") as f:
-        json.dump(output, f, indent=2)
+    write_json(out_path, output)
     print(f"\n✓ Results saved to {out_path}")
 
+    if not WRITE_FINDINGS:
+        return
+
     # Generate findings markdown
-    md_path = os.path.join(os.path.dirname(__file__), "results", "FRAGILITY_FINDINGS.md")
-    with open(md_path, "w") as f:
-        f.write(f"""# Fragility Test: Llama-3-8B
+    ranked_rows = sorted(arch_rows, key=itemgetter(1), reverse=True)
+    md_path = RESULTS / "FRAGILITY_FINDINGS.md"
+    with io.StringIO() as buf:
+        buf.write(f"""# Fragility Test: Llama-3-8B
 
 ## A model with 66.6% accuracy? Only if you ask the right way.
 
@@ -92,11 +104,13 @@ Our Sensitivity Sweep tested the same model across **{len(arch_rows)} prompt arc
 | Architecture | Overall | STEM | Humanities | Social Sciences | Other |
 |-------------|---------|------|------------|-----------------|-------|
 """)
-        for arch_key, overall, stem, hum, soc, oth in sorted(arch_rows, key=lambda x: -x[1]):
-            marker = " ⭐" if abs(overall - LEADERBOARD_SCORE) < 1.5 else ""
-            f.write(f"| {arch_key} | {overall:.1f}%{marker} | {stem:.1f}% | {hum:.1f}% | {soc:.1f}% | {oth:.1f}% |\n")
+        buf.write("".join(
+            f"| {arch_key} | {overall:.1f}%{' ⭐' if abs(overall - LEADERBOARD_SCORE) < 1.5 else ''} "
+            f"| {stem:.1f}% | {hum:.1f}% | {soc:.1f}% | {oth:.1f}% |\n"
+            for arch_key, overall, stem, hum, soc, oth in ranked_rows
+        ))
 
-        f.write(f"""
+        buf.write(f"""
 ⭐ = Closest to leaderboard-reported score
 
 ---
@@ -157,6 +171,8 @@ Each architecture is tested across all MMLU subjects (STEM, Humanities, Social S
 
 > **One number doesn't tell the whole story. Project Spark tells the rest.**
 """)
+        with open(md_path, "w") as f:
+            f.write(buf.getvalue())
 
     print(f"✓ Findings saved to {md_path}")
 
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Manifest Upload Check
+======================
+Posts manifest CSVs to /api/compliance/audit and checks that each row is classified
+the same way the original csv.DictReader ingestion classified it, including rows
+that carry more fields than the header.
+"""
+
+import sys, os, io, csv
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from backend.compliance_service import get_default_auditor
+from backend.main import app
+
+UPLOADS = {
+    "well-formed": (
+        "source_url,domain,word_count\n"
+        "https://nytimes.com/a,nytimes.com,1200\n"
+        "https://en.wikipedia.org/wiki/A,wikipedia.org,800\n"
+    ),
+    "ragged first row": (
+        "source_url,domain\n"
+        "https://nytimes.com/a,nytimes.com,extra\n"
+        "https://example.com/b,example.com\n"
+    ),
+    "ragged later row": (
+        "source_url,domain\n"
+        "https://example.com/b,example.com\n"
+        "https://wsj.com/c,wsj.com,extra,more\n"
+    ),
+}
+
+
+def dictreader_risks(text):
+    """Risk level per row as the DictReader ingestion assigned it (surplus fields ignored)."""
+    auditor = get_default_auditor()
+    return [
+        auditor._classify_domain(auditor._extract_domain(row.get("domain") or row.get("source_url", "")))[0].value
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def main():
+    print("=" * 70)
+    print("  Manifest Upload Check — Project Spark")
+    print("=" * 70)
+
+    client = TestClient(app)
+    failures = 0
+    for name, text in UPLOADS.items():
+        response = client.post(
+            "/api/compliance/audit", files={"file": ("manifest.csv", text.encode(), "text/csv")},
+        )
+        assert response.status_code == 200, f"{name}: HTTP {response.status_code} {response.text}"
+        got = [row["risk_level"] for row in response.json()["rows"]]
+        expected = dictreader_risks(text)
+        ok = got == expected
+        failures += not ok
+        print(f"  {name:<18} {'✅' if ok else '❌'}  {got}" + ("" if ok else f" (expected {expected})"))
+
+    assert failures == 0, f"{failures} upload(s) diverged from the DictReader path"
+    print("\n✓ All uploads match the DictReader classification")
+
+
+if __name__ == "__main__":
+    main()
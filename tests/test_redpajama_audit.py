@@ -4,192 +4,186 @@ RedPajama-Data-1T Copyright Audit
 ===================================
 Builds a realistic manifest of ~200 URLs representing RedPajama's documented
 composition, then runs Project Spark's ComplianceAuditor against it.
+
+Set SPARK_WRITE_FINDINGS=1 to also write the findings markdown to tests/results/.
 """
 
-import sys, os, json, csv, random
+import sys, os, io, csv
+from operator import attrgetter, itemgetter
+from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from backend.compliance_service import ComplianceAuditor
+import numpy as np
+
+from tests.result_io import write_json
+from backend.compliance_service import get_default_auditor
 from backend.models import ManifestRow
 
-random.seed(42)
+RESULTS = Path(__file__).parent / "results"
+# The findings markdown is a demo artifact; it is only written when SPARK_WRITE_FINDINGS=1
+WRITE_FINDINGS = os.environ.get("SPARK_WRITE_FINDINGS") == "1"
+
+SEED = 42
+
+MANIFEST_FIELDS = ("source_url", "domain", "content_type", "word_count", "date_collected", "license", "copyright_holder")
 
 # ── Build realistic RedPajama manifest ────────────────────────
 
-def generate_manifest():
-    """Generate ~200 rows mimicking RedPajama-Data-1T's documented composition."""
-    rows = []
-
-    # CommonCrawl subset (~72% = 144 rows) — mix of domains found in CC dumps
-    cc_domains = [
-        ("nytimes.com", 8), ("washingtonpost.com", 5), ("bbc.com", 6), ("cnn.com", 5),
-        ("bloomberg.com", 4), ("ft.com", 3), ("forbes.com", 4), ("reuters.com", 3),
-        ("theguardian.com", 4), ("latimes.com", 3), ("economist.com", 2), ("wsj.com", 3),
-        ("newyorker.com", 2), ("wired.com", 2), ("theatlantic.com", 2), ("time.com", 2),
-        ("usatoday.com", 2), ("chicagotribune.com", 2),
-        ("reddit.com", 10), ("medium.com", 8), ("stackoverflow.com", 6),
-        ("quora.com", 4), ("wordpress.com", 5), ("blogspot.com", 5),
-        ("nature.com", 3), ("sciencedirect.com", 2), ("springer.com", 2),
-        ("wikipedia.org", 8), ("arxiv.org", 4),
-        ("github.com", 5), ("example.com", 10), ("randomsite.org", 8),
-        ("personalblog.net", 6),
+# CommonCrawl subset (~72% = 144 rows) — mix of domains found in CC dumps
+CC_DOMAINS = [
+    ("nytimes.com", 8), ("washingtonpost.com", 5), ("bbc.com", 6), ("cnn.com", 5),
+    ("bloomberg.com", 4), ("ft.com", 3), ("forbes.com", 4), ("reuters.com", 3),
+    ("theguardian.com", 4), ("latimes.com", 3), ("economist.com", 2), ("wsj.com", 3),
+    ("newyorker.com", 2), ("wired.com", 2), ("theatlantic.com", 2), ("time.com", 2),
+    ("usatoday.com", 2), ("chicagotribune.com", 2),
+    ("reddit.com", 10), ("medium.com", 8), ("stackoverflow.com", 6),
+    ("quora.com", 4), ("wordpress.com", 5), ("blogspot.com", 5),
+    ("nature.com", 3), ("sciencedirect.com", 2), ("springer.com", 2),
+    ("wikipedia.org", 8), ("arxiv.org", 4),
+    ("github.com", 5), ("example.com", 10), ("randomsite.org", 8),
+    ("personalblog.net", 6),
+]
+
+# C4 subset (~12% = 24 rows)
+C4_DOMAINS = [("nytimes.com", 3), ("bbc.com", 3), ("reddit.com", 4),
+              ("medium.com", 3), ("wikipedia.org", 4), ("example.com", 4), ("blogspot.com", 3)]
+
+# Books subset (~4% = 8 rows)
+BOOK_DOMAINS = [("gutenberg.org", 3), ("penguin.com", 2), ("harpercollins.com", 1),
+                ("simonandschuster.com", 1), ("archive.org", 1)]
+
+
+def _draw(rng, low, high, n):
+    """``n`` random integers in [low, high] from ``rng``, like random.randint, as a list."""
+    return rng.integers(low, high + 1, size=n).tolist()
+
+
+def _cells(domains):
+    """(domain, i) for each of a domain's ``count`` rows, in table order."""
+    return [(domain, i) for domain, count in domains for i in range(count)]
+
+
+def common_crawl_block(rng):
+    """CommonCrawl subset, one row per CC_DOMAINS entry count."""
+    cells = _cells(CC_DOMAINS)
+    ids, word_counts = _draw(rng, 1000, 9999, len(cells)), _draw(rng, 500, 5000, len(cells))
+    return [
+        ManifestRow(source_url=f"https://www.{domain}/article/{id_}-content-{i}", domain=domain,
+                    content_type="text/html", word_count=words, date_collected="2023-04-15",
+                    license="unknown", copyright_holder="")
+        for (domain, i), id_, words in zip(cells, ids, word_counts)
     ]
 
-    for domain, count in cc_domains:
-        for i in range(count):
-            rows.append(ManifestRow(
-                source_url=f"https://www.{domain}/article/{random.randint(1000,9999)}-content-{i}",
-                domain=domain,
-                content_type="text/html",
-                word_count=random.randint(500, 5000),
-                date_collected="2023-04-15",
-                license="unknown",
-                copyright_holder="",
-            ))
-
-    # C4 subset (~12% = 24 rows)
-    c4_domains = [("nytimes.com", 3), ("bbc.com", 3), ("reddit.com", 4),
-                  ("medium.com", 3), ("wikipedia.org", 4), ("example.com", 4), ("blogspot.com", 3)]
-    for domain, count in c4_domains:
-        for i in range(count):
-            rows.append(ManifestRow(
-                source_url=f"https://{domain}/c4-cleaned/{random.randint(1000,9999)}",
-                domain=domain, content_type="text/html",
-                word_count=random.randint(300, 3000), date_collected="2023-03-01",
-                license="unknown", copyright_holder="",
-            ))
-
-    # GitHub subset (~5% = 10 rows)
-    for i in range(10):
-        rows.append(ManifestRow(
-            source_url=f"https://github.com/user{i}/repo{i}/blob/main/file.py",
-            domain="github.com", content_type="text/plain",
-            word_count=random.randint(100, 2000), date_collected="2023-04-01",
-            license="mixed", copyright_holder="",
-        ))
 
-    # Books subset (~4% = 8 rows)
-    book_domains = [("gutenberg.org", 3), ("penguin.com", 2), ("harpercollins.com", 1),
-                    ("simonandschuster.com", 1), ("archive.org", 1)]
-    for domain, count in book_domains:
-        for i in range(count):
-            rows.append(ManifestRow(
-                source_url=f"https://{domain}/books/{random.randint(100,999)}",
-                domain=domain, content_type="text/plain",
-                word_count=random.randint(5000, 50000), date_collected="2023-02-15",
-                license="unknown", copyright_holder="",
-            ))
-
-    # ArXiv subset (~2% = 4 rows)
-    for i in range(4):
-        rows.append(ManifestRow(
-            source_url=f"https://arxiv.org/abs/2304.{random.randint(10000,19999)}",
-            domain="arxiv.org", content_type="application/pdf",
-            word_count=random.randint(3000, 10000), date_collected="2023-04-10",
-            license="arXiv license", copyright_holder="",
-        ))
+def c4_block(rng):
+    """C4 subset, one row per C4_DOMAINS entry count."""
+    cells = _cells(C4_DOMAINS)
+    ids, word_counts = _draw(rng, 1000, 9999, len(cells)), _draw(rng, 300, 3000, len(cells))
+    return [
+        ManifestRow(source_url=f"https://{domain}/c4-cleaned/{id_}", domain=domain,
+                    content_type="text/html", word_count=words, date_collected="2023-03-01",
+                    license="unknown", copyright_holder="")
+        for (domain, _), id_, words in zip(cells, ids, word_counts)
+    ]
 
-    # Wikipedia subset (~3% = 6 rows)
-    for i in range(6):
-        rows.append(ManifestRow(
-            source_url=f"https://en.wikipedia.org/wiki/Article_{i}",
-            domain="wikipedia.org", content_type="text/html",
-            word_count=random.randint(1000, 8000), date_collected="2023-04-01",
-            license="CC BY-SA 3.0", copyright_holder="Wikipedia contributors",
-        ))
 
-    # StackExchange subset (~2% = 4 rows)
-    for i in range(4):
-        rows.append(ManifestRow(
-            source_url=f"https://stackexchange.com/questions/{random.randint(10000,99999)}",
-            domain="stackexchange.com", content_type="text/html",
-            word_count=random.randint(200, 1500), date_collected="2023-03-20",
-            license="CC BY-SA 4.0", copyright_holder="",
-        ))
+def github_block(rng):
+    """GitHub subset (~5% = 10 rows)."""
+    return [
+        ManifestRow(source_url=f"https://github.com/user{i}/repo{i}/blob/main/file.py", domain="github.com",
+                    content_type="text/plain", word_count=words, date_collected="2023-04-01",
+                    license="mixed", copyright_holder="")
+        for i, words in enumerate(_draw(rng, 100, 2000, 10))
+    ]
 
-    random.shuffle(rows)
-    return rows
 
+def books_block(rng):
+    """Books subset, one row per BOOK_DOMAINS entry count."""
+    cells = _cells(BOOK_DOMAINS)
+    ids, word_counts = _draw(rng, 100, 999, len(cells)), _draw(rng, 5000, 50000, len(cells))
+    return [
+        ManifestRow(source_url=f"https://{domain}/books/{id_}", domain=domain,
+                    content_type="text/plain", word_count=words, date_collected="2023-02-15",
+                    license="unknown", copyright_holder="")
+        for (domain, _), id_, words in zip(cells, ids, word_counts)
+    ]
 
-def main():
-    print("=" * 70)
-    print("  RedPajama-Data-1T Copyright Audit — Project Spark")
-    print("=" * 70)
 
-    rows = generate_manifest()
-    print(f"\n📋 Generated manifest: {len(rows)} URLs representing RedPajama composition\n")
+def arxiv_block(rng):
+    """ArXiv subset (~2% = 4 rows)."""
+    ids, word_counts = _draw(rng, 10000, 19999, 4), _draw(rng, 3000, 10000, 4)
+    return [
+        ManifestRow(source_url=f"https://arxiv.org/abs/2304.{id_}", domain="arxiv.org",
+                    content_type="application/pdf", word_count=words, date_collected="2023-04-10",
+                    license="arXiv license", copyright_holder="")
+        for id_, words in zip(ids, word_counts)
+    ]
 
-    # Save manifest CSV
-    csv_path = os.path.join(os.path.dirname(__file__), "results", "redpajama_manifest.csv")
-    with open(csv_path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["source_url", "domain", "content_type", "word_count", "date_collected", "license", "copyright_holder"])
-        for r in rows:
-            w.writerow([r.source_url, r.domain, r.content_type, r.word_count, r.date_collected, r.license, r.copyright_holder])
 
-    # Run audit
-    auditor = ComplianceAuditor()
-    result = auditor.audit_manifest(rows)
+def wikipedia_block(rng):
+    """Wikipedia subset (~3% = 6 rows)."""
+    return [
+        ManifestRow(source_url=f"https://en.wikipedia.org/wiki/Article_{i}", domain="wikipedia.org",
+                    content_type="text/html", word_count=words, date_collected="2023-04-01",
+                    license="CC BY-SA 3.0", copyright_holder="Wikipedia contributors")
+        for i, words in enumerate(_draw(rng, 1000, 8000, 6))
+    ]
 
-    s = result.summary
-    print(f"Total sources scanned:  {s.total_sources}")
-    print(f"🔴 High risk:           {s.high_risk_count} ({s.high_risk_percentage}%)")
-    print(f"🟡 Medium risk:         {s.medium_risk_count}")
-    print(f"🟢 Low risk:            {s.low_risk_count}")
-    print(f"⚪ Unknown:             {s.unknown_risk_count}")
-    print()
 
-    print("Top risky domains:")
-    for d in s.top_risky_domains:
-        print(f"  {d['risk_level'].upper():6s} | {d['domain']:25s} | {d['publisher']:30s} | {d['count']} URLs")
+def stackexchange_block(rng):
+    """StackExchange subset (~2% = 4 rows)."""
+    ids, word_counts = _draw(rng, 10000, 99999, 4), _draw(rng, 200, 1500, 4)
+    return [
+        ManifestRow(source_url=f"https://stackexchange.com/questions/{id_}", domain="stackexchange.com",
+                    content_type="text/html", word_count=words, date_collected="2023-03-20",
+                    license="CC BY-SA 4.0", copyright_holder="")
+        for id_, words in zip(ids, word_counts)
+    ]
 
-    print("\nRecommendations:")
-    for r in s.recommendations:
-        print(f"  {r}")
 
-    # Save JSON results
-    json_path = os.path.join(os.path.dirname(__file__), "results", "redpajama_audit_results.json")
-    out = {
-        "audit_id": result.audit_id,
-        "timestamp": result.timestamp,
-        "summary": {
-            "total_sources": s.total_sources,
-            "high_risk_count": s.high_risk_count,
-            "medium_risk_count": s.medium_risk_count,
-            "low_risk_count": s.low_risk_count,
-            "unknown_risk_count": s.unknown_risk_count,
-            "high_risk_percentage": s.high_risk_percentage,
-            "top_risky_domains": s.top_risky_domains,
-            "recommendations": s.recommendations,
-        },
-        "rows": [
-            {
-                "source_url": r.source_url,
-                "domain": r.domain,
-                "risk_level": r.risk_level.value,
-                "reason": r.risk_reason,
-                "publisher": r.publisher,
-            }
-            for r in result.rows
-        ],
-    }
-    with open(json_path, "w") as f:
-        json.dump(out, f, indent=2)
-    print(f"\n✓ Results saved to {json_path}")
+MANIFEST_BLOCKS = (
+    common_crawl_block, c4_block, github_block, books_block,
+    arxiv_block, wikipedia_block, stackexchange_block,
+)
+
+
+def generate_manifest():
+    """Generate ~200 rows mimicking RedPajama-Data-1T's documented composition."""
+    rng = np.random.default_rng(SEED)
+    rows = [row for block in MANIFEST_BLOCKS for row in block(rng)]
+    return [rows[i] for i in rng.permutation(len(rows)).tolist()]
 
-    # Generate findings markdown
-    high_domains = {}
-    medium_domains = {}
-    for r in result.rows:
-        bucket = high_domains if r.risk_level.value == "high" else medium_domains if r.risk_level.value == "medium" else None
-        if bucket is not None:
-            if r.domain not in bucket:
-                bucket[r.domain] = {"publisher": r.publisher, "reason": r.risk_reason, "count": 0}
-            bucket[r.domain]["count"] += 1
 
-    md_path = os.path.join(os.path.dirname(__file__), "results", "REDPAJAMA_FINDINGS.md")
-    with open(md_path, "w") as f:
-        f.write(f"""# Copyright Audit: RedPajama-Data-1T
+def _ranked(domains):
+    """(domain, count, info) triples from a domain -> info table, most URLs first (ties keep order)."""
+    ranked = [(domain, info["count"], info) for domain, info in domains.items()]
+    ranked.sort(key=itemgetter(1), reverse=True)
+    return ranked
+
+
+# ── Output writers ──
+
+def _write_csv(path, rows):
+    # The manifest is a list of ManifestRows, not a DataFrame, so csv.writer streams it directly
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(MANIFEST_FIELDS)
+        w.writerows(map(attrgetter(*MANIFEST_FIELDS), rows))
+
+
+def _write_text(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _findings_markdown(result):
+    """Render the REDPAJAMA_FINDINGS.md report for an audit result."""
+    s = result.summary
+    high_domains = s.domains_by_risk["high"]
+    medium_domains = s.domains_by_risk["medium"]
+
+    with io.StringIO() as buf:
+        buf.write(f"""# Copyright Audit: RedPajama-Data-1T
 
 ## I found {s.high_risk_count} copyrighted sources in a "Clean" open dataset using Project Spark
 
@@ -218,10 +212,12 @@ These sources are from publishers **actively suing AI companies** or with **stri
 | Domain | Publisher | Reason | URLs Found |
 |--------|-----------|--------|------------|
 """)
-        for domain, info in sorted(high_domains.items(), key=lambda x: -x[1]["count"]):
-            f.write(f"| `{domain}` | {info['publisher']} | {info['reason']} | {info['count']} |\n")
+        buf.write("".join(
+            f"| `{domain}` | {info['publisher']} | {info['reason']} | {info['count']} |\n"
+            for domain, _, info in _ranked(high_domains)
+        ))
 
-        f.write(f"""
+        buf.write(f"""
 ## Medium-Risk Sources
 
 These sources have **Terms of Service restrictions** or require **attribution**:
@@ -229,11 +225,13 @@ These sources have **Terms of Service restrictions** or require **attribution**:
 | Domain | Publisher | Reason | URLs Found |
 |--------|-----------|--------|------------|
 """)
-        for domain, info in sorted(medium_domains.items(), key=lambda x: -x[1]["count"]):
-            f.write(f"| `{domain}` | {info['publisher']} | {info['reason']} | {info['count']} |\n")
+        buf.write("".join(
+            f"| `{domain}` | {info['publisher']} | {info['reason']} | {info['count']} |\n"
+            for domain, _, info in _ranked(medium_domains)
+        ))
 
         risky_pct = round((s.high_risk_count + s.medium_risk_count) / s.total_sources * 100, 1)
-        f.write(f"""
+        buf.write(f"""
 ---
 
 ## Key Finding
@@ -261,8 +259,74 @@ Project Spark's Compliance Auditor performs **source provenance analysis**:
 
 This approach catches copyright risk that **text-matching tools miss** — because it tracks *where data came from*, not what it looks like after processing.
 """)
+        return buf.getvalue()
+
 
-    print(f"✓ Findings saved to {md_path}")
+def main():
+    RESULTS.mkdir(exist_ok=True)
+    print("=" * 70)
+    print("  RedPajama-Data-1T Copyright Audit — Project Spark")
+    print("=" * 70)
+
+    rows = generate_manifest()
+    print(f"\n📋 Generated manifest: {len(rows)} URLs representing RedPajama composition\n")
+
+    # Run audit
+    auditor = get_default_auditor()
+    result = auditor.audit_manifest(rows)
+
+    s = result.summary
+    print(f"Total sources scanned:  {s.total_sources}")
+    print(f"🔴 High risk:           {s.high_risk_count} ({s.high_risk_percentage}%)")
+    print(f"🟡 Medium risk:         {s.medium_risk_count}")
+    print(f"🟢 Low risk:            {s.low_risk_count}")
+    print(f"⚪ Unknown:             {s.unknown_risk_count}")
+    print()
+
+    print("Top risky domains:")
+    for d in s.top_risky_domains:
+        print(f"  {d['risk_level'].upper():6s} | {d['domain']:25s} | {d['publisher']:30s} | {d['count']} URLs")
+
+    print("\nRecommendations:")
+    for r in s.recommendations:
+        print(f"  {r}")
+
+    # JSON results
+    json_path = RESULTS / "redpajama_audit_results.json"
+    out = {
+        "audit_id": result.audit_id,
+        "timestamp": result.timestamp,
+        "summary": {
+            "total_sources": s.total_sources,
+            "high_risk_count": s.high_risk_count,
+            "medium_risk_count": s.medium_risk_count,
+            "low_risk_count": s.low_risk_count,
+            "unknown_risk_count": s.unknown_risk_count,
+            "high_risk_percentage": s.high_risk_percentage,
+            "top_risky_domains": s.top_risky_domains,
+            "recommendations": s.recommendations,
+        },
+        "rows": [
+            {
+                "source_url": r.source_url,
+                "domain": r.domain,
+                "risk_level": r.risk_level,
+                "reason": r.risk_reason,
+                "publisher": r.publisher,
+            }
+            for r in result.rows
+        ],
+    }
+
+    # Save the manifest CSV, JSON results and (optionally) the findings markdown
+    _write_csv(RESULTS / "redpajama_manifest.csv", rows)
+    write_json(json_path, out)
+    md_path = RESULTS / "REDPAJAMA_FINDINGS.md"
+    if WRITE_FINDINGS:
+        _write_text(md_path, _findings_markdown(result))
+    print(f"\n✓ Results saved to {json_path}")
+    if WRITE_FINDINGS:
+        print(f"✓ Findings saved to {md_path}")
 
 
 if __name__ == "__main__":